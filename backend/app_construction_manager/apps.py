@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppConstructionManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_construction_manager"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,210 @@
+import gzip
+import pickle
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from faker import Faker
+
+from app_construction_manager.extra.Bulk import MAX_QUERY_PARAMS, batch_size, chunked, insert_rows
+from app_construction_manager.extra.Cache import bump_version
+from app_construction_manager.extra.Search import get_search_backend
+from app_construction_manager.models import Address, Company, Product, SearchToken
+from app_construction_manager.scripts.FakerCompany import build_address, build_company
+from app_construction_manager.scripts.FakerProduct import build_product
+from global_auth.models import update_primary_group_name
+
+OWNER_EMAIL = 'benchmark@example.com'
+GROUPS = ['Admin', 'Kierownik', 'Pracownik']
+CHUNK = 200
+SNAPSHOT_CHUNK = 10000
+SNAPSHOT_VERSION = 2
+
+
+def generate_chunk(task):
+    """
+    Runs in a worker process, no database access. Generates unsaved rows for
+    companies [start, start + size) with their own RNG seeded by (seed, start),
+    so the result does not depend on the number of workers. Search tokens are
+    computed here as well, they only need the field values.
+    """
+    seed, start, size, products_per_company, with_tokens = task
+    fake = Faker('pl_PL')
+    fake.seed_instance(f'{seed}:{start}')
+    rng = random.Random(f'{seed}:{start}')
+    backend = get_search_backend() if with_tokens else None
+
+    rows = []
+    for _ in range(size):
+        company = build_company(fake, build_address(fake, rng), None, rng)
+        products = [build_product(company, None, rng) for _ in range(products_per_company)]
+        tokens = [backend.tokens_for(row) for row in [company, *products]] if backend else None
+        rows.append((company, products, tokens))
+    return rows
+
+
+def insert_chunk(rows, owner):
+    addresses = [company.address for company, _, _ in rows]
+    companies = [company for company, _, _ in rows]
+    products = [product for _, chunk, _ in rows for product in chunk]
+    for row in companies + products:
+        row.create_by = owner
+
+    with transaction.atomic():
+        Address.objects.bulk_create(addresses, batch_size=batch_size(Address))
+        Company.objects.bulk_create(companies, batch_size=batch_size(Company))
+        Product.objects.bulk_create(products, batch_size=batch_size(Product))
+
+        # Indeks wyszukiwarki to ~100 wierszy na obiekt - bez tworzenia instancji SearchToken
+        insert_rows(SearchToken, ['model_label', 'object_id', 'token', 'weight'], (
+            (row._meta.label_lower, row.pk, token, weight)
+            for company, chunk, row_tokens in rows if row_tokens is not None
+            for row, weights in zip([company, *chunk], row_tokens)
+            for token, weight in weights.items()
+        ))
+    return [company.pk for company in companies]
+
+
+def seed_dataset(companies, products_per_company, users=0, seed=0, index_search=True, workers=None,
+                 password='password', log=print):
+    """
+    Seeds a deterministic dataset (same `seed` -> same rows) using the shapes
+    from scripts/FakerCompany.py and scripts/FakerProduct.py. Rows are generated
+    in a process pool and inserted with bulk_create in parameter-limit sized batches.
+    Returns the owner user (staff, member of the first company).
+    """
+    User = get_user_model()
+    fake = Faker('pl_PL')
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+
+    groups = [Group.objects.get_or_create(name=name)[0] for name in GROUPS]
+    # Jeden hash dla wszystkich kont - haszowanie per wiersz trwałoby dłużej niż cały insert
+    password_hash = make_password(password)
+    owner = User.objects.create(email=OWNER_EMAIL, username=OWNER_EMAIL, password=password_hash, is_staff=True)
+
+    tasks = [
+        (seed, start, min(CHUNK, companies - start), products_per_company, index_search)
+        for start in range(0, companies, CHUNK)
+    ]
+    # workers=1 - bez puli procesów (testy, debugowanie)
+    company_ids = []
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup) if workers != 1 else None
+    try:
+        # map() zachowuje kolejność - klucze główne są takie same przy każdym uruchomieniu
+        results = executor.map(generate_chunk, tasks) if executor else map(generate_chunk, tasks)
+        for task, rows in zip(tasks, results):
+            company_ids += insert_chunk(rows, owner)
+            log(f" - {task[1] + task[2]}/{companies} firm")
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if company_ids:
+        owner.user_company_id = company_ids[0]
+        owner.save(update_fields=['user_company'])
+
+    members = User.objects.bulk_create([
+        User(
+            email=f"pracownik{i}@example.com", username=f"pracownik{i}@example.com", password=password_hash,
+            first_name=fake.first_name(), last_name=fake.last_name(),
+            user_company_id=company_ids[i % len(company_ids)] if company_ids else None,
+        )
+        for i in range(users)
+    ], batch_size=batch_size(User))
+    Membership = User.groups.through
+    Membership.objects.bulk_create([
+        Membership(customuser_id=member.pk, group_id=rng.choice(groups).pk) for member in members
+    ], batch_size=batch_size(Membership))
+    # bulk_create nie wysyła m2m_changed - primary_group_name uzupełniamy jednym UPDATE
+    update_primary_group_name(User.objects.filter(groups__isnull=False, primary_group_name__isnull=True))
+
+    # bulk_create nie wysyła sygnałów - unieważniamy cache ręcznie
+    bump_version(Address, Company, Product, User, Group)
+    return owner
+
+
+def snapshot_models():
+    User = get_user_model()
+    # Kolejność zgodna z kluczami obcymi; user_company wczytywane po firmach (cykl User <-> Company)
+    return [
+        (Group, ()),
+        (User, ('user_company_id',)),
+        (User.groups.through, ()),
+        (Address, ()),
+        (Company, ()),
+        (Product, ()),
+        (SearchToken, ()),
+    ]
+
+
+def dump_snapshot(path, log=print):
+    """
+    Writes all seeded tables to a gzip-compressed pickle stream, chunk by chunk.
+    Rows are stored as raw database values, so a snapshot loads only into the same database vendor.
+    """
+    with gzip.open(path, 'wb', compresslevel=1) as file, connection.cursor() as cursor:
+        pickle.dump({'version': SNAPSHOT_VERSION, 'vendor': connection.vendor}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        quote = connection.ops.quote_name
+        for model, _ in snapshot_models():
+            fields = model._meta.concrete_fields
+            pickle.dump((model._meta.label, [field.attname for field in fields]), file, protocol=pickle.HIGHEST_PROTOCOL)
+            cursor.execute(
+                f"SELECT {', '.join(quote(field.column) for field in fields)} "
+                f"FROM {quote(model._meta.db_table)} ORDER BY {quote(model._meta.pk.column)}"
+            )
+            total = 0
+            while chunk := cursor.fetchmany(SNAPSHOT_CHUNK):
+                pickle.dump([tuple(row) for row in chunk], file, protocol=pickle.HIGHEST_PROTOCOL)
+                total += len(chunk)
+            pickle.dump(None, file, protocol=pickle.HIGHEST_PROTOCOL)
+            log(f" - {model._meta.label}: {total}")
+
+
+def load_snapshot(path, log=print):
+    """
+    Loads a snapshot written by dump_snapshot() into empty tables, keeping primary keys.
+    Uses pickle - load only snapshots you created yourself.
+    """
+    models = {model._meta.label: (model, deferred) for model, deferred in snapshot_models()}
+    postponed = defaultdict(list)
+
+    with gzip.open(path, 'rb') as file, transaction.atomic():
+        header = pickle.load(file)
+        if header.get('version') != SNAPSHOT_VERSION or header.get('vendor') != connection.vendor:
+            raise ValueError(f"Snapshot {header} does not match version {SNAPSHOT_VERSION} / {connection.vendor}")
+
+        for _ in models:
+            label, columns = pickle.load(file)
+            model, deferred = models[label]
+            pk_index = columns.index(model._meta.pk.attname)
+            deferred_indexes = [columns.index(column) for column in deferred]
+            total = 0
+            while (chunk := pickle.load(file)) is not None:
+                if deferred_indexes:
+                    chunk = [list(row) for row in chunk]
+                    for row in chunk:
+                        for index in deferred_indexes:
+                            if row[index] is not None:
+                                postponed[model, columns[index], row[index]].append(row[pk_index])
+                                row[index] = None
+                insert_rows(model, columns, chunk)
+                total += len(chunk)
+            log(f" - {label}: {total}")
+
+        for (model, column, value), pks in postponed.items():
+            for chunk in chunked(pks, MAX_QUERY_PARAMS):
+                model.objects.filter(pk__in=chunk).update(**{column: value})
+
+        # Postgres: sekwencje po wstawieniu jawnych kluczy głównych
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model for model, _ in models.values()]):
+                cursor.execute(sql)
+
+    bump_version(*[model for model, _ in models.values()])
@@ -0,0 +1,91 @@
+import statistics
+import time
+import tracemalloc
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from app_construction_manager.extra.Queries import QueryCounter
+from app_construction_manager.extra.ResponseCache import get_list_cache
+from global_auth.authentication import get_token_cache, get_user_cache
+
+
+def fetch(client, item):
+    response = client.get(item['url'], item['params'])
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def percentile(timings, value):
+    if len(timings) == 1:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method='inclusive')[value - 1]
+
+
+def run_scenario(client, item, repeat=10):
+    """
+    Times one scenario: a cold request (empty caches), `repeat` warm requests
+    for p50/p95, then one request counting queries and one under tracemalloc,
+    so neither instrumentation distorts the timings. The scenario's
+    `settings` are overridden for the whole measurement.
+    """
+    with override_settings(**item.get('settings', {})):
+        return measure_scenario(client, item, repeat)
+
+
+def measure_scenario(client, item, repeat):
+    cache.clear()
+    get_list_cache().clear()
+    get_user_cache().clear()
+    get_token_cache().clear()
+    start = time.perf_counter()
+    response = fetch(client, item)
+    cold = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch(client, item)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    with QueryCounter() as counter:
+        fetch(client, item)
+
+    tracemalloc.start()
+    try:
+        fetch(client, item)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'url': item['url'],
+        'params': item['params'],
+        'status': response.status_code,
+        'cold_ms': round(cold * 1000, 2),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'queries': counter.count,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_delta_ms=1.0, min_delta_kb=64):
+    """
+    Regressions of `current` against `baseline`: p50/p95 and peak memory worse
+    by more than `threshold` (and by more than the noise floor), or any extra query.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        for metric, floor in (('p50_ms', min_delta_ms), ('p95_ms', min_delta_ms), ('peak_memory_kb', min_delta_kb)):
+            before, after = previous[metric], result[metric]
+            if after > before * (1 + threshold) and after - before >= floor:
+                regressions.append({'scenario': name, 'metric': metric, 'baseline': before, 'current': after})
+        if result['queries'] > previous['queries']:
+            regressions.append({'scenario': name, 'metric': 'queries',
+                                'baseline': previous['queries'], 'current': result['queries']})
+    return regressions
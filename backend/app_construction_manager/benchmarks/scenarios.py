@@ -0,0 +1,120 @@
+import math
+from datetime import date
+
+import django_filters
+from django.db import models
+from django.urls import reverse
+from rest_framework import filters
+
+from app_construction_manager.extra.Search import resolve
+from app_construction_manager.urls import router
+
+PAGE_SIZE = 15
+LARGE_PAGE_SIZE = 1000
+# Serializer porównywany bez cache odpowiedzi list - każdy powtórzony request serializuje stronę od nowa
+NO_LIST_CACHE = {'LIST_RESPONSE_CACHE': {'MAX_ENTRIES': 0}}
+# Uwierzytelnienie bez cache tokenów i użytkowników - każdy request weryfikuje JWT i czyta użytkownika z bazy
+NO_AUTH_CACHE = {'AUTH_USER_CACHE': {'MAX_ENTRIES': 0}, 'AUTH_TOKEN_CACHE': {'MAX_ENTRIES': 0}}
+# Pary scenariuszy: `nazwa` względem `nazwa + sufiks` (ten sam request, wyłączona optymalizacja)
+PAIRED_SCENARIOS = ((':drf', 'compiled/drf'), (':uncached', 'cached/uncached'))
+
+
+def scenario(name, url, params=None, settings=None):
+    return {'name': name, 'url': url, 'params': params or {}, 'settings': settings or {}}
+
+
+def filter_params(name, flt, sample):
+    """Query params hitting filter `flt` with a value taken from `sample` (None when not applicable)."""
+    param = getattr(flt, 'param_name', name)
+    value = resolve(sample, flt.field_name)
+    if isinstance(value, models.Manager):
+        related = value.first()
+        value = resolve(related, getattr(flt, 'related_field', 'pk')) if related else None
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, date) and hasattr(flt, 'param_name'):
+        # CustomDateRangeFilter: zakres jednego dnia
+        day = value.strftime('%Y-%m-%d')
+        return {param: [day, day]}
+    if isinstance(value, bool):
+        # BooleanInFilter - frontend wysyła is_active[]=true
+        if isinstance(flt, django_filters.BaseInFilter):
+            param = f'{param}[]'
+        value = str(value).lower()
+    elif isinstance(value, models.Model):
+        value = value.pk
+    elif isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, str) and flt.lookup_expr == 'icontains':
+        # Fragment ze środka wartości - jak wpisywany w filtr kolumny
+        value = value[1:5] or value
+    return {param: value}
+
+
+def ordering_fields(viewset, model):
+    if viewset.ordering_fields == '__all__':
+        return [field.name for field in model._meta.fields if field.name != 'password']
+    return list(viewset.ordering_fields or [])
+
+
+def search_term(viewset, sample):
+    for path in viewset.search_fields or []:
+        value = resolve(sample, path)
+        if isinstance(value, str) and value.strip():
+            return value.split()[0]
+    return None
+
+
+def build_scenarios(client):
+    """
+    Scenarios for every ViewSet registered in app urls: first page, deep page,
+    every Filter field, global search, every ordering (both directions) and export,
+    a large page serialized by the compiled and by the DRF serializer, plus `auth:me`
+    measuring the per-request authentication overhead with and without the auth caches.
+    Sample values come from a row in the middle of the list seen by `client`.
+    """
+    result = []
+    for prefix, viewset, basename in router.registry:
+        url = reverse(f'{basename}-list')
+        model = viewset.queryset.model
+        first = client.get(url, {'page': 1, 'page_size': PAGE_SIZE}).data
+        count = first['count']
+        if not count:
+            continue
+        middle = client.get(url, {'page': math.ceil(count / PAGE_SIZE / 2), 'page_size': PAGE_SIZE}).data
+        sample = model._default_manager.get(pk=middle['results'][0]['id'])
+
+        result.append(scenario(f'{prefix}:list', url, {'page': 1, 'page_size': PAGE_SIZE}))
+        result.append(scenario(f'{prefix}:deep_page', url, {'page': math.ceil(count / PAGE_SIZE), 'page_size': PAGE_SIZE}))
+
+        # Skompilowany serializer (extra/Compiled.py) i serializer DRF na tej samej dużej stronie
+        large_page = {'page': 1, 'page_size': LARGE_PAGE_SIZE}
+        result.append(scenario(f'{prefix}:large_page', url, large_page, {**NO_LIST_CACHE, 'COMPILED_SERIALIZERS': True}))
+        result.append(scenario(f'{prefix}:large_page:drf', url, large_page,
+                               {**NO_LIST_CACHE, 'COMPILED_SERIALIZERS': False}))
+
+        for name, flt in viewset.filterset_class.base_filters.items():
+            params = filter_params(name, flt, sample)
+            if params is not None:
+                result.append(scenario(f'{prefix}:filter:{name}', url, {'page': 1, 'page_size': PAGE_SIZE, **params}))
+
+        term = search_term(viewset, sample)
+        if term and any(issubclass(backend, filters.SearchFilter) for backend in viewset.filter_backends):
+            result.append(scenario(f'{prefix}:search', url, {'page': 1, 'page_size': PAGE_SIZE, 'search': term}))
+
+        for field in ordering_fields(viewset, model):
+            for ordering in (field, f'-{field}'):
+                result.append(scenario(f'{prefix}:ordering:{ordering}', url,
+                                       {'page': 1, 'page_size': PAGE_SIZE, 'ordering': ordering}))
+
+        # Eksport produktów ograniczony do jednej firmy - pełny eksport to osobny, długi pomiar
+        export_params = {'export_format': 'csv'}
+        if hasattr(model, 'company'):
+            export_params['company'] = sample.company_id
+        result.append(scenario(f'{prefix}:export', f'{url}export/', export_params))
+
+    # Najtańszy endpoint - czas to praktycznie narzut uwierzytelnienia (weryfikacja JWT + użytkownik)
+    result.append(scenario('auth:me', reverse('auth-api:user-me')))
+    result.append(scenario('auth:me:uncached', reverse('auth-api:user-me'), settings=NO_AUTH_CACHE))
+    return result
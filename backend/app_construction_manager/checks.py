@@ -0,0 +1,15 @@
+from django.core.checks import Warning, register
+
+from global_project.cache import versioned_cache_enabled
+
+
+@register()
+def versioned_cache_check(app_configs, **kwargs):
+    if versioned_cache_enabled():
+        return []
+    return [Warning(
+        "Zliczenia i cache odpowiedzi list są wyłączone: CACHES['default'] działa w pamięci procesu, "
+        "a WEB_CONCURRENCY nie jest ustawione na 1.",
+        hint="Ustaw CACHE_URL na cache współdzielony przez workery (np. redis://) albo WEB_CONCURRENCY=1.",
+        id='app_construction_manager.W001',
+    )]
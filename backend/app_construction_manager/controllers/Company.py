@@ -1,8 +1,18 @@
 import django_filters
 from rest_framework import serializers, viewsets, filters
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.settings import api_settings
 from app_construction_manager.models import Company, Address
+from app_construction_manager.extra.Bulk import BulkCreateMixin, BulkListSerializer, batch_size
+from app_construction_manager.extra.Compiled import CompiledListMixin
+from app_construction_manager.extra.Export import ExportMixin
+from app_construction_manager.extra.Fields import DynamicFieldsMixin, RelationPlanMixin, SparseFieldsMixin
+from app_construction_manager.extra.Instrumentation import ServerTimingMixin
+from app_construction_manager.extra.Queries import ExplainMixin
+from app_construction_manager.extra.ResponseCache import CachedListMixin, ConditionalGetMixin
+from app_construction_manager.extra.Pagination import KeysetPagination
+from app_construction_manager.extra.Renderers import COLUMNAR_RENDERERS
+from app_construction_manager.extra.Search import FullTextSearchFilter
 from django.db import models
 from datetime import datetime, timedelta
 
@@ -42,18 +52,35 @@ class BooleanInFilter(django_filters.BaseInFilter, django_filters.BooleanFilter)
             return qs.filter(**{f"{self.field_name}__in": bool_values})
         return qs
     
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Address
         fields = '__all__'
 
-class Serializer(serializers.ModelSerializer):
+class ListSerializer(BulkListSerializer):
+    def create(self, validated_data):
+        # Stała liczba zapytań na paczkę: INSERT adresów, potem INSERT firm z kluczami zwróconymi przez bazę
+        request = self.context.get('request')
+        create_by = request.user if request and request.user.is_authenticated else None
+
+        addresses = Address.objects.bulk_create(
+            [Address(**attrs['address']) for attrs in validated_data], batch_size=batch_size(Address)
+        )
+        companies = []
+        for attrs, address in zip(validated_data, addresses):
+            attrs = {key: value for key, value in attrs.items() if key != 'address'}
+            companies.append(Company(address=address, create_by=create_by, **attrs))
+        return Company.objects.bulk_create(companies, batch_size=batch_size(Company))
+
+class Serializer(DynamicFieldsMixin, serializers.ModelSerializer):
     address = AddressSerializer()
     create_by = serializers.PrimaryKeyRelatedField(read_only=True)
     
     class Meta:
         model = model
         fields = '__all__'
+        list_serializer_class = ListSerializer
+        expandable_fields = {'create_by': 'app_construction_manager.controllers.User.SummarySerializer'}
 
     def create(self, validated_data):
         # 1. Extract nested address data from incoming JSON
@@ -106,20 +133,26 @@ class Filter(django_filters.FilterSet):
         model = model
         fields = '__all__'
 
-class Pagination(PageNumberPagination):
+class Pagination(KeysetPagination):
     page_query_param = 'page'
     page_size_query_param = 'page_size'
 
-class ViewSet(viewsets.ModelViewSet):
+class ViewSet(ExplainMixin, ConditionalGetMixin, CachedListMixin, CompiledListMixin, RelationPlanMixin, SparseFieldsMixin,
+              ServerTimingMixin, ExportMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset = model.objects.all()
     serializer_class = Serializer
     pagination_class = Pagination
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *COLUMNAR_RENDERERS]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = Filter
     ordering_fields = '__all__'
     ordering = ['-created_at']
     search_fields = ['id', 'is_active', 'name', 'email', 'phone_number_1', 'vat_id', 'regon_id', 'address__state',
                      'address__city', 'address__postal_code']
+    export_fields = ['id', 'is_active', 'created_at', 'name', 'email', 'phone_number_1', 'phone_number_2',
+                     'phone_number_3', 'vat_id', 'regon_id', 'timezone', 'address.street', 'address.building_number',
+                     'address.apartment_number', 'address.postal_code', 'address.city', 'address.state',
+                     'address.country', 'updated_at', 'create_by']
 
 
 
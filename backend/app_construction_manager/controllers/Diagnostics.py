@@ -0,0 +1,60 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from app_construction_manager.extra.Instrumentation import slow_requests
+from app_construction_manager.extra.ResponseCache import get_list_cache
+from app_construction_manager.extra.SingleFlight import get_single_flight
+from global_auth.authentication import get_token_cache, get_user_cache
+
+
+class SlowRequestsView(APIView):
+    """Recent slow requests (newest first) with their SQL; DELETE clears the buffer."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        entries = slow_requests.all()
+        return Response({'count': len(entries), 'results': entries})
+
+    def delete(self, request):
+        slow_requests.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ListCacheView(APIView):
+    """Hit / miss counters of the list response cache in this process; DELETE clears it."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_list_cache().stats())
+
+    def delete(self, request):
+        get_list_cache().clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AuthCacheView(APIView):
+    """Token (JWT decode) cache counters of this process; DELETE clears the token and user caches."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'tokens': get_token_cache().stats(), 'users': len(get_user_cache())})
+
+    def delete(self, request):
+        get_token_cache().clear()
+        get_user_cache().clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SingleFlightView(APIView):
+    """Coalescing counters of concurrent list / count queries in this process; DELETE resets them."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        flight = get_single_flight()
+        return Response(flight.stats() if flight else {'enabled': False})
+
+    def delete(self, request):
+        flight = get_single_flight()
+        if flight:
+            flight.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
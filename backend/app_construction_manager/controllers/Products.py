@@ -1,8 +1,18 @@
 import django_filters
 from rest_framework import serializers, viewsets, filters
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.settings import api_settings
 from app_construction_manager.models import Product
+from app_construction_manager.extra.Bulk import BulkListSerializer, BulkMixin
+from app_construction_manager.extra.Compiled import CompiledListMixin
+from app_construction_manager.extra.Export import ExportMixin
+from app_construction_manager.extra.Fields import DynamicFieldsMixin, RelationPlanMixin, SparseFieldsMixin
+from app_construction_manager.extra.Instrumentation import ServerTimingMixin
+from app_construction_manager.extra.Queries import ExplainMixin
+from app_construction_manager.extra.ResponseCache import CachedListMixin, ConditionalGetMixin
+from app_construction_manager.extra.Pagination import KeysetPagination
+from app_construction_manager.extra.Renderers import COLUMNAR_RENDERERS
+from app_construction_manager.extra.Search import FullTextSearchFilter
 from django.db import models
 from datetime import datetime, timedelta
 
@@ -42,10 +52,15 @@ class BooleanInFilter(django_filters.BaseInFilter, django_filters.BooleanFilter)
             return qs.filter(**{f"{self.field_name}__in": bool_values})
         return qs
     
-class Serializer(serializers.ModelSerializer):
+class Serializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = model
         fields = '__all__'
+        list_serializer_class = BulkListSerializer
+        expandable_fields = {
+            'company': 'app_construction_manager.controllers.Company.Serializer',
+            'create_by': 'app_construction_manager.controllers.User.SummarySerializer',
+        }
 
 class Filter(django_filters.FilterSet):
     name = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
@@ -56,20 +71,25 @@ class Filter(django_filters.FilterSet):
         model = model
         fields = '__all__'
 
-class Pagination(PageNumberPagination):
+class Pagination(KeysetPagination):
     page_query_param = 'page'
     page_size_query_param = 'page_size'
 
-class ViewSet(viewsets.ModelViewSet):
+class ViewSet(ExplainMixin, ConditionalGetMixin, CachedListMixin, CompiledListMixin, RelationPlanMixin, SparseFieldsMixin,
+              ServerTimingMixin, ExportMixin, BulkMixin, viewsets.ModelViewSet):
     queryset = model.objects.all()
     serializer_class = Serializer
     pagination_class = Pagination
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *COLUMNAR_RENDERERS]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = Filter
     ordering_fields = '__all__'
     ordering = ['-created_at']
     search_fields = ['id', 'name', 'description', 'price_net', 'price_gross', 'estimated_duration_weeks', 'usable_area_m2', 
                      'net_area_m2', 'gross_volume_m3', 'is_active']
+    export_fields = ['id', 'is_active', 'created_at', 'name', 'description', 'price_net', 'price_gross',
+                     'estimated_duration_weeks', 'usable_area_m2', 'net_area_m2', 'gross_volume_m3', 'company',
+                     'updated_at', 'create_by']
 
 
 
@@ -1,16 +1,29 @@
 import django_filters
 from rest_framework import serializers, viewsets, filters, status
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.settings import api_settings
 from global_auth.models import CustomUser
 from app_construction_manager.extra.Filters import CustomDateRangeFilter, BooleanInFilter,RelatedNameFilter
+from app_construction_manager.extra.Compiled import CompiledListMixin
+from app_construction_manager.extra.Export import ExportMixin
+from app_construction_manager.extra.Fields import DynamicFieldsMixin, RelationPlanMixin, SparseFieldsMixin
+from app_construction_manager.extra.Instrumentation import ServerTimingMixin
+from app_construction_manager.extra.Queries import ExplainMixin
+from app_construction_manager.extra.ResponseCache import CachedListMixin
+from app_construction_manager.extra.Pagination import KeysetPagination
+from app_construction_manager.extra.Renderers import COLUMNAR_RENDERERS
 from rest_framework.response import Response
 from django.contrib.auth.models import Group
-from django.db.models import Min
 
 model = CustomUser
 
-class Serializer(serializers.ModelSerializer):
+class SummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Rozwinięcie create_by w firmach i produktach (?expand=create_by)
+    class Meta:
+        model = model
+        fields = ['id', 'first_name', 'last_name', 'email']
+
+class Serializer(DynamicFieldsMixin, serializers.ModelSerializer):
     groups = serializers.SlugRelatedField(
         many=True,
         slug_field='name',
@@ -21,7 +34,8 @@ class Serializer(serializers.ModelSerializer):
     class Meta:
         model = model
         fields = ['id', 'first_name', 'last_name', 'email', 'user_company', 'is_active',
-        'last_login','date_joined', 'groups', 'username']
+        'last_login','date_joined', 'groups', 'username', 'primary_group_name']
+        expandable_fields = {'user_company': 'app_construction_manager.controllers.Company.Serializer'}
 
     def create(self, validated_data):
         groups_data = validated_data.pop('groups', None)
@@ -49,37 +63,37 @@ class Filter(django_filters.FilterSet):
         model = model
         fields = '__all__'
 
-class Pagination(PageNumberPagination):
+class Pagination(KeysetPagination):
     page_query_param = 'page'
     page_size_query_param = 'page_size'
+    cursor_ordering = ('-date_joined', '-id')
 
-class ViewSet(viewsets.ModelViewSet):
+class ViewSet(ExplainMixin, CachedListMixin, CompiledListMixin, RelationPlanMixin, SparseFieldsMixin, ServerTimingMixin,
+              ExportMixin, viewsets.ModelViewSet):
     queryset = model.objects.all()
     serializer_class = Serializer
     pagination_class = Pagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *COLUMNAR_RENDERERS]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
     filterset_class = Filter
     ordering_fields = '__all__'
     search_fields = ['first_name', 'last_name', 'email', 'user_company__name', 'is_active',
         'last_login','date_joined', 'groups__name']
+    export_fields = ['id', 'first_name', 'last_name', 'email', 'username', 'groups', 'is_active',
+                     'last_login', 'date_joined', 'user_company']
 
     def get_queryset(self):
         user = self.request.user
-        qs = CustomUser.objects.filter(user_company=user.user_company)
-
-        # Dodajemy adnotację z minimalną nazwą grupy
-        qs = qs.annotate(
-            first_group_name=Min('groups__name')
-        )
+        qs = super().get_queryset().filter(user_company=user.user_company)
 
         # Pobierz parametry sortowania z zapytania
         ordering = self.request.query_params.get('ordering')
         if ordering:
-            # jeśli zamówienie dotyczy groups lub -groups, zamień na first_group_name
+            # jeśli zamówienie dotyczy groups lub -groups, sortujemy po zapisanej pierwszej grupie (primary_group_name)
             if ordering == 'groups':
-                ordering = 'first_group_name'
+                ordering = 'primary_group_name'
             elif ordering == '-groups':
-                ordering = '-first_group_name'
+                ordering = '-primary_group_name'
             qs = qs.order_by(ordering)
         else:
             # domyślne sortowanie (np. email)
@@ -0,0 +1,288 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, transaction
+from django.utils import timezone
+from rest_framework import exceptions, serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from app_construction_manager.extra.Cache import bump_version
+from app_construction_manager.extra.Search import get_search_backend
+
+# MSSQL: maks. 2100 parametrów w jednym zapytaniu i 1000 wierszy w INSERT ... VALUES;
+# zostawiamy zapas na parametry dodawane przez backend
+MAX_QUERY_PARAMS = 2000
+MAX_INSERT_ROWS = 1000
+
+_bulk_operation = ContextVar('bulk_operation', default=False)
+
+
+def batch_size(model, fields=None, using='default'):
+    """Rows per bulk_create/bulk_update statement that fit every supported backend's parameter limit."""
+    if fields is None:
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    size = min(MAX_INSERT_ROWS, MAX_QUERY_PARAMS // max(len(fields), 1))
+    return max(1, min(size, connections[using].ops.bulk_batch_size(fields, [None] * size)))
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def insert_rows(model, columns, rows, using='default'):
+    """
+    Multi-row INSERT of ready database values (tuples ordered like `columns`),
+    without building model instances - for millions of rows (search index, snapshots).
+    Does not send signals nor fill auto_now fields.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(column) for column in columns]
+    size = batch_size(model, fields, using)
+    placeholder = f"({', '.join(['%s'] * len(columns))})"
+    table = quote(model._meta.db_table)
+    insert = f"INSERT INTO {table} ({', '.join(quote(field.column) for field in fields)}) VALUES "
+    # MSSQL: jawne wartości kolumny IDENTITY wymagają IDENTITY_INSERT
+    identity = connection.vendor == 'microsoft' and model._meta.pk in fields
+
+    with connection.cursor() as cursor:
+        if identity:
+            cursor.execute(f"SET IDENTITY_INSERT {table} ON")
+        try:
+            for chunk in chunked(rows, size):
+                cursor.execute(insert + ', '.join([placeholder] * len(chunk)), [value for row in chunk for value in row])
+        finally:
+            if identity:
+                cursor.execute(f"SET IDENTITY_INSERT {table} OFF")
+
+
+@contextmanager
+def bulk_operation():
+    """Inside the block per-object signal handlers (search index) are skipped - the bulk path handles them once."""
+    token = _bulk_operation.set(True)
+    try:
+        yield
+    finally:
+        _bulk_operation.reset(token)
+
+
+def in_bulk_operation():
+    return _bulk_operation.get()
+
+
+def touch_auto_now(instances, fields):
+    # bulk_update pomija pre_save() - pola auto_now (updated_at) ustawiamy ręcznie
+    now = timezone.now()
+    auto_now = [field for field in instances[0]._meta.concrete_fields if getattr(field, 'auto_now', False)]
+    for instance in instances:
+        for field in auto_now:
+            setattr(instance, field.attname, now)
+    return fields | {field.name for field in auto_now}
+
+
+def to_pk(model, value):
+    """Client-supplied primary key normalized the way in_bulk() keys it; None when it is not a valid pk."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return model._meta.pk.to_python(value)
+    except DjangoValidationError:
+        return None
+
+
+class PrefetchedRelated:
+    """
+    Stands in for a PrimaryKeyRelatedField queryset during bulk validation:
+    all referenced objects are read with in_bulk up front, `.get(pk=...)` hits a dict.
+    """
+
+    def __init__(self, queryset, values):
+        self.model = queryset.model
+        pks = {pk for pk in map(self.to_pk, values) if pk is not None}
+        self.objects = {}
+        for chunk in chunked(pks, MAX_QUERY_PARAMS):
+            self.objects.update(queryset.in_bulk(chunk))
+
+    def to_pk(self, value):
+        return to_pk(self.model, value)
+
+    def get(self, pk):
+        key = self.to_pk(pk)
+        if key is None:
+            raise TypeError(pk)
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise self.model.DoesNotExist from None
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    `many=True` serializer writing with bulk_create / bulk_update.
+
+    For updates `instance` is a {pk: object} dict and every item carries its `id`;
+    validation errors are returned per item, in input order.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        value = data.get('id') if isinstance(data, dict) else None
+        pk = to_pk(self.child.Meta.model, value)
+        if pk is None and value is not None:
+            raise exceptions.ValidationError({'id': [
+                serializers.PrimaryKeyRelatedField.default_error_messages['incorrect_type'].format(
+                    data_type=type(value).__name__
+                )
+            ]})
+        instance = self.instance.get(pk)
+        if instance is None:
+            raise exceptions.ValidationError({'id': [exceptions.NotFound.default_detail]})
+        self.child.instance = instance
+        self.child.initial_data = data
+        try:
+            validated = super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+        self._updated.append(instance)
+        return validated
+
+    def to_internal_value(self, data):
+        self._updated = []
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        # Jedno zapytanie na relację zamiast queryset.get() dla każdego elementu
+        originals = {}
+        for name, field in self.child.fields.items():
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                originals[name] = field.queryset
+                field.queryset = PrefetchedRelated(
+                    field.queryset, [item.get(name) for item in data if isinstance(item, dict)]
+                )
+        try:
+            return super().to_internal_value(data)
+        finally:
+            for name, queryset in originals.items():
+                self.child.fields[name].queryset = queryset
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = [model(**attrs) for attrs in validated_data]
+        return model.objects.bulk_create(instances, batch_size=batch_size(model))
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for obj, attrs in zip(self._updated, validated_data):
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            fields |= attrs.keys()
+        if not fields:
+            return self._updated
+
+        fields = sorted(touch_auto_now(self._updated, fields))
+        # CASE WHEN pk = %s THEN %s dla każdego pola + pk IN (...)
+        size = batch_size(model, [model._meta.get_field(name) for name in fields] * 2 + [model._meta.pk])
+        model.objects.bulk_update(self._updated, fields, batch_size=size)
+        return self._updated
+
+
+class BulkCreateMixin:
+    """
+    POST of a JSON list to the list endpoint creates all items with bulk_create.
+
+    The whole batch is validated in one pass and written in one transaction;
+    on any error nothing is written and the response lists errors per item.
+    Requires a BulkListSerializer subclass as `list_serializer_class` in the serializer Meta.
+    """
+    bulk_max_items = 1000
+
+    def get_bulk_payload(self, request):
+        if not isinstance(request.data, list):
+            raise exceptions.ValidationError({'non_field_errors': ["Expected a list of items."]})
+        if len(request.data) > self.bulk_max_items:
+            raise exceptions.ValidationError(
+                {'non_field_errors': [f"Ensure this list has no more than {self.bulk_max_items} items."]}
+            )
+        return request.data
+
+    def after_bulk_write(self, instances):
+        # bulk_create / bulk_update nie wysyłają sygnałów
+        model = self.get_queryset().model
+        bump_version(model)
+        get_search_backend().index(instances)
+
+    def bulk_response(self, serializer, status_code):
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic(), bulk_operation():
+            instances = serializer.save()
+            self.after_bulk_write(instances)
+        data = self.get_serializer(instances, many=True).data
+        return Response(data, status=status_code)
+
+    def perform_bulk_create(self, request):
+        payload = self.get_bulk_payload(request)
+        serializer = self.get_serializer(data=payload, many=True)
+        return self.bulk_response(serializer, status.HTTP_201_CREATED)
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.perform_bulk_create(request)
+        return super().create(request, *args, **kwargs)
+
+
+class BulkMixin(BulkCreateMixin):
+    """
+    {list_url}bulk/ with a JSON list payload:
+
+    - POST   [{...}, ...]            -> bulk_create, 201 with created objects
+    - PATCH  [{"id": 1, ...}, ...]   -> partial bulk_update, 200 with updated objects
+    - DELETE [1, 2, ...]             -> delete, 200 {"deleted": n}
+
+    Same all-or-nothing validation and per-item errors as BulkCreateMixin.
+    """
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        return self.perform_bulk_create(request)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        payload = self.get_bulk_payload(request)
+        model = self.get_queryset().model
+        # Te same klucze co w BulkListSerializer.run_child_validation ("1" i 1 to ten sam obiekt)
+        ids = {to_pk(model, item.get('id')) for item in payload if isinstance(item, dict)} - {None}
+        instances = {}
+        for chunk in chunked(ids, MAX_QUERY_PARAMS):
+            instances.update(self.get_queryset().in_bulk(chunk))
+        serializer = self.get_serializer(instances, data=payload, many=True, partial=True)
+        return self.bulk_response(serializer, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        ids = self.get_bulk_payload(request)
+        model = self.get_queryset().model
+        pks = [to_pk(model, value) for value in ids]
+
+        existing = set()
+        for chunk in chunked([pk for pk in pks if pk is not None], MAX_QUERY_PARAMS):
+            existing.update(self.get_queryset().filter(pk__in=chunk).values_list('pk', flat=True))
+        errors = [{} if pk in existing else {'id': [exceptions.NotFound.default_detail]} for pk in pks]
+        if any(errors):
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        deleted = 0
+        with transaction.atomic(), bulk_operation():
+            for chunk in chunked(sorted(existing), MAX_QUERY_PARAMS):
+                deleted += model.objects.filter(pk__in=chunk).delete()[1].get(model._meta.label, 0)
+                get_search_backend().remove(model, chunk)
+            bump_version(model)
+        return Response({'deleted': deleted})
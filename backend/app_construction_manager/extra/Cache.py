@@ -0,0 +1,117 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
+
+from app_construction_manager.extra.SingleFlight import single_flight
+from global_project.cache import VERSION_KEY, bump_keys, get_versions, model_label, versioned_cache_enabled
+
+MODIFIED_KEY = 'cm:modified:{}'
+COUNT_KEY = 'cm:count:{}:{}:{}'
+COUNT_TIMEOUT = 300
+
+
+def bump_version(*models):
+    """Invalidates everything cached for the given models and records the time of the write."""
+    bump_keys(*[VERSION_KEY.format(model_label(model)) for model in models])
+    keys = [MODIFIED_KEY.format(model_label(model)) for model in models]
+
+    def stamp():
+        cache.set_many(dict.fromkeys(keys, time.time()), None)
+
+    stamp()
+    transaction.on_commit(stamp)
+
+
+def dependencies(model):
+    # Model + modele, do których prowadzą jego FK/M2M (np. Company -> Address, CustomUser -> Group)
+    models = [model]
+    for field in model._meta.get_fields():
+        if field.is_relation and field.concrete and field.related_model and field.related_model not in models:
+            models.append(field.related_model)
+    return models
+
+
+def get_last_modified(*models):
+    """
+    Time of the last write to any of the models, without touching the database.
+    A model with no recorded write (e.g. after a cache restart) counts as modified now.
+    """
+    keys = [MODIFIED_KEY.format(model_label(model)) for model in models]
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, None)
+        values.update(cache.get_many(missing))
+    return datetime.fromtimestamp(max(values.values(), default=time.time()), tz=timezone.utc)
+
+
+def queryset_fingerprint(queryset):
+    # SQL po zastosowaniu Filter/SearchFilter - to on jest znormalizowaną postacią parametrów
+    # (kolejność i nadmiarowe parametry w URL nie mają znaczenia, tenant jest w WHERE).
+    sql, params = queryset.order_by().query.sql_with_params()
+    return hashlib.sha1(f"{sql}|{params!r}".encode('utf-8')).hexdigest()
+
+
+def count_key(queryset):
+    """Count cache key of a queryset or None when it cannot match any row."""
+    try:
+        fingerprint = queryset_fingerprint(queryset)
+    except EmptyResultSet:
+        return None
+
+    models = dependencies(queryset.model)
+    versions = '.'.join(str(version) for version in get_versions(*models))
+    return COUNT_KEY.format(model_label(queryset.model), versions, fingerprint)
+
+
+def cached_count(queryset):
+    if not versioned_cache_enabled():
+        return queryset.count()
+
+    key = count_key(queryset)
+    if key is None:
+        return 0
+
+    count = cache.get(key)
+    if count is None:
+        # Równoczesne requesty z tym samym filtrem liczą raz
+        count = single_flight(key, queryset.count)
+        cache.set(key, count, COUNT_TIMEOUT)
+    return count
+
+
+def estimated_count(queryset):
+    """
+    Row count taken from table statistics when the queryset is unfiltered.
+    Filtered querysets fall back to the cached exact count.
+    """
+    if queryset.query.where:
+        return cached_count(queryset)
+
+    table = queryset.model._meta.db_table
+    queries = {
+        'microsoft': (
+            "SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+            "WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)"
+        ),
+        'postgresql': "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+        'sqlite': "SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+    }
+    sql = queries.get(connection.vendor)
+    if sql:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [table])
+                row = cursor.fetchone()
+            if row and row[0] is not None and row[0] >= 0:
+                return int(row[0])
+        except Exception:
+            # Brak statystyk (np. sqlite bez ANALYZE) - liczymy dokładnie
+            pass
+    return cached_count(queryset)
@@ -0,0 +1,216 @@
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query import BaseIterable, ValuesIterable
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from app_construction_manager.extra.Bulk import MAX_QUERY_PARAMS, chunked
+from app_construction_manager.extra.Fields import EXPAND_PARAM, FIELDS_PARAM, pk_only
+from app_construction_manager.extra.Instrumentation import measure
+
+# Pola DRF, których to_representation zwraca wartość z bazy bez zmian (str(str), int(int), bool)
+PASSTHROUGH = (serializers.CharField, serializers.EmailField, serializers.BooleanField, serializers.IntegerField)
+
+
+class NotCompilable(Exception):
+    """The serializer uses a field the compiled path cannot reproduce exactly."""
+
+
+class ManyRelation:
+    """A `many=True` relation of the root serializer, loaded for a whole page with one query."""
+
+    def __init__(self, key, model_field, attr, convert):
+        self.key = key
+        self.model_field = model_field
+        self.attr = attr
+        self.convert = convert
+
+    def load(self, rows, pk):
+        query_name = self.model_field.related_query_name()
+        values = {}
+        for ids in chunked([row[pk] for row in rows], MAX_QUERY_PARAMS):
+            # Ten sam JOIN i WHERE co prefetch_related, więc i ta sama kolejność
+            pairs = self.model_field.related_model._default_manager.filter(
+                **{f"{query_name}__in": ids}
+            ).values_list(query_name, self.attr)
+            for owner, value in pairs:
+                values.setdefault(owner, []).append(value if self.convert is None else self.convert(value))
+        for row in rows:
+            row[self.key] = values.get(row[pk], [])
+
+
+def converter(path, convert):
+    if convert is None:
+        return itemgetter(path)
+
+    def value(row):
+        item = row[path]
+        return None if item is None else convert(item)
+    return value
+
+
+def compile_fields(serializer, model, prefix, paths, many):
+    """(key, row -> value) for every readable field; `.values()` paths and many relations are collected on the way."""
+    if type(serializer).to_representation is not serializers.Serializer.to_representation:
+        raise NotCompilable(type(serializer).__name__)
+    return [(field.field_name, compile_field(field, model, prefix, paths, many)) for field in serializer._readable_fields]
+
+
+def compile_field(field, model, prefix, paths, many):
+    if field.source == '*' or len(field.source_attrs) != 1:
+        raise NotCompilable(field.field_name)
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        raise NotCompilable(field.field_name)
+    path = f"{prefix}{field.source}"
+
+    if isinstance(field, serializers.ManyRelatedField):
+        child = field.child_relation
+        if prefix or not isinstance(model_field, models.ManyToManyField):
+            raise NotCompilable(field.field_name)
+        if pk_only(child):
+            attr, convert = model_field.related_model._meta.pk.name, child.pk_field and child.pk_field.to_representation
+        elif type(child) is serializers.SlugRelatedField and '__' not in child.slug_field:
+            attr, convert = child.slug_field, None
+        else:
+            raise NotCompilable(field.field_name)
+        key = f"{path}[]"
+        many.append(ManyRelation(key, model_field, attr, convert))
+        return itemgetter(key)
+
+    if not model_field.is_relation:
+        if isinstance(model_field, models.FileField):
+            raise NotCompilable(field.field_name)  # .values() zwraca nazwę pliku, a nie FieldFile
+        paths.append(path)
+        return converter(path, None if type(field) in PASSTHROUGH else field.to_representation)
+
+    if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+        raise NotCompilable(field.field_name)
+    if pk_only(field):
+        paths.append(path)  # wartość klucza obcego, tak jak PKOnlyObject
+        return converter(path, field.pk_field and field.pk_field.to_representation)
+    if type(field) is serializers.SlugRelatedField and '__' not in field.slug_field:
+        paths.append(f"{path}__{field.slug_field}")
+        return itemgetter(f"{path}__{field.slug_field}")
+    if isinstance(field, serializers.Serializer):
+        paths.append(path)
+        steps = compile_fields(field, model_field.related_model, f"{path}__", paths, many)
+
+        def nested(row):
+            return None if row[path] is None else {key: value(row) for key, value in steps}
+        return nested
+    raise NotCompilable(field.field_name)
+
+
+class ValuesRowIterable(BaseIterable):
+    # .values() dopiero przy odczycie: COUNT(*) i klucz cache liczby rekordów zostają te same co dla modelu
+    paths = ()
+
+    def __iter__(self):
+        queryset = self.queryset.values(*self.paths)
+        return iter(ValuesIterable(queryset, self.chunked_fetch, self.chunk_size))
+
+
+class CompiledSerializer:
+    """
+    Read-only equivalent of a ModelSerializer for lists: rows are fetched with
+    `.values()` (nested serializers become joins) and turned into dicts by
+    converters prepared once, producing exactly what the serializer would.
+    Many-to-many relations of the root are loaded with one query per page.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.pk = model._meta.pk.attname
+        self.paths = [self.pk]
+        self.many = []
+        self.steps = compile_fields(serializer, model, '', self.paths, self.many)
+        self.paths = list(dict.fromkeys(self.paths))
+
+    def queryset(self, queryset, extra=()):
+        """`queryset` returning value rows; filtering, ordering, slicing and counting stay those of the model queryset."""
+        iterable = type('CompiledValuesIterable', (ValuesRowIterable,), {'paths': [*self.paths, *extra]})
+        queryset = queryset.prefetch_related(None)
+        queryset._iterable_class = iterable
+        return queryset
+
+    def load_related(self, rows):
+        for relation in self.many:
+            relation.load(rows, self.pk)
+
+    def to_representation(self, rows):
+        steps = self.steps
+        return [{key: value(row) for key, value in steps} for row in rows]
+
+
+_compiled = {}
+
+
+def compile_serializer(serializer):
+    try:
+        return CompiledSerializer(serializer)
+    except NotCompilable:
+        return None
+
+
+def class_compiled_serializer(serializer_class):
+    # Serializer bez ?fields= / ?expand= zależy tylko od klasy - kompilowany raz na proces
+    if serializer_class not in _compiled:
+        _compiled[serializer_class] = compile_serializer(serializer_class())
+    return _compiled[serializer_class]
+
+
+class CompiledListMixin:
+    """
+    ViewSet mixin: `list` and `export` go through CompiledSerializer instead of
+    the DRF serializer; the response is the same byte for byte. Serializers
+    with fields it cannot reproduce (method fields, custom to_representation,
+    dotted sources...) and COMPILED_SERIALIZERS = False use the DRF path.
+    """
+    compiled_actions = ('list', 'export')
+
+    def get_compiled_serializer(self):
+        if not getattr(settings, 'COMPILED_SERIALIZERS', True) or self.action not in self.compiled_actions:
+            return None
+        if not hasattr(self, '_compiled_serializer'):
+            params = self.request.query_params
+            if FIELDS_PARAM in params or EXPAND_PARAM in params:
+                self._compiled_serializer = compile_serializer(self.get_serializer())
+            else:
+                self._compiled_serializer = class_compiled_serializer(self.get_serializer_class())
+        return self._compiled_serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return queryset
+        # Pola klucza kursora są potrzebne do zbudowania linku na następną stronę
+        ordering = getattr(self.paginator, 'cursor_ordering', ()) if self.paginator else ()
+        return compiled.queryset(queryset, [field.lstrip('-') for field in ordering])
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        compiled.load_related(rows)
+        with measure('serialize'):
+            data = compiled.to_representation(rows)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def serialize_chunk(self, chunk):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().serialize_chunk(chunk)
+        compiled.load_related(chunk)
+        return compiled.to_representation(chunk)
@@ -0,0 +1,239 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_paths(value):
+    # "id,address.city,company" -> {"id": [], "address": ["city"], "company": []}
+    paths = {}
+    for item in (value or '').split(','):
+        name, _, rest = item.strip().partition('.')
+        if name:
+            paths.setdefault(name, [])
+            if rest:
+                paths[name].append(rest)
+    return paths
+
+
+def expandable_fields(serializer):
+    return getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+
+
+def narrow(serializer, fields=None, expand=None, prefix=''):
+    """
+    Drops fields not listed in `fields` and swaps relations listed in `expand`
+    for the serializer from Meta.expandable_fields, recursively for dotted names.
+    `fields` / `expand` are parse_paths() dicts; None keeps every field.
+    """
+    expand = expand or {}
+    available = expandable_fields(serializer)
+    unknown = [f"{prefix}{name}" for name in expand if name not in available]
+    if fields is not None:
+        unknown += [f"{prefix}{name}" for name in fields if name not in serializer.fields]
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: [f"Nieznane pole: {name}" for name in unknown]})
+
+    for name, nested_expand in expand.items():
+        serializer_class = available[name]
+        if isinstance(serializer_class, str):
+            serializer_class = import_string(serializer_class)
+        source = serializer.fields[name].source
+        serializer.fields[name] = serializer_class(read_only=True, **({'source': source} if source != name else {}))
+
+    if fields is not None:
+        for name in list(serializer.fields):
+            if name not in fields:
+                serializer.fields.pop(name)
+
+    for name, field in serializer.fields.items():
+        nested_fields = fields.get(name) if fields is not None else None
+        nested_expand = expand.get(name)
+        if isinstance(field, serializers.BaseSerializer) and (nested_fields or nested_expand):
+            child = field.child if isinstance(field, serializers.ListSerializer) else field
+            narrow(child, parse_paths(','.join(nested_fields)) if nested_fields else None,
+                   parse_paths(','.join(nested_expand)) if nested_expand else None, f"{prefix}{name}.")
+    return serializer
+
+
+def load_plan(serializer, model=None, prefix=''):
+    """
+    Columns for `.only()` reading exactly the fields of `serializer`, nested
+    serializers included. None when a field cannot be mapped to a column
+    (method fields, dotted sources) - the caller then loads whole rows.
+    """
+    model = model or serializer.Meta.model
+    only = [] if prefix else [model._meta.pk.name]
+    for field in serializer.fields.values():
+        if field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if model_field.many_to_many or model_field.one_to_many:
+            continue  # prefetch_related, nie kolumna
+        path = f"{prefix}{field.source}"
+        only.append(path)
+        if isinstance(field, serializers.BaseSerializer) and model_field.is_relation:
+            nested = load_plan(field, model_field.related_model, f"{path}__")
+            if nested is None:
+                return None
+            only += nested
+    return only
+
+
+def follow(model, attrs):
+    # source_attrs pola -> relacje po drodze; zatrzymuje się na kolumnie albo relacji "wiele"
+    joins = []
+    for attr in attrs:
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not model_field.is_relation:
+            break
+        joins.append(attr)
+        model = model_field.related_model
+        if model_field.many_to_many or model_field.one_to_many:
+            return joins, True, model
+    return joins, False, model
+
+
+def pk_only(field):
+    # PrimaryKeyRelatedField czyta samo *_id, bez ładowania obiektu
+    return isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization()
+
+
+def relation_plan(serializer, model=None, prefix=''):
+    """
+    (select_related, prefetch_related) loading every relation `serializer`
+    reads: nested serializers and SlugRelatedFields are joined, `many=True`
+    relations are prefetched with a Prefetch queryset built the same way
+    for the nested serializer. PrimaryKeyRelatedFields need no load.
+    """
+    model = model or serializer.Meta.model
+    select, prefetch = [], []
+    for field in serializer.fields.values():
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                nested_select, nested_prefetch = relation_plan(field, model, prefix)
+                select += nested_select
+                prefetch += nested_prefetch
+            continue
+
+        joins, many, related_model = follow(model, field.source_attrs)
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        child = child.child_relation if isinstance(child, serializers.ManyRelatedField) else child
+        if len(joins) == len(field.source_attrs) and pk_only(child) and not many:
+            joins = joins[:-1]
+        if not joins:
+            continue
+
+        paths = [f"{prefix}{'__'.join(joins[:i + 1])}" for i in range(len(joins))]
+        if not many:
+            select += paths
+            if isinstance(child, serializers.BaseSerializer):
+                nested_select, nested_prefetch = relation_plan(child, related_model, f"{paths[-1]}__")
+                select += nested_select
+                prefetch += nested_prefetch
+            continue
+
+        select += paths[:-1]
+        queryset = related_model._default_manager.all()
+        if isinstance(child, serializers.BaseSerializer):
+            nested_select, nested_prefetch = relation_plan(child, related_model)
+            if nested_select:
+                queryset = queryset.select_related(*nested_select)
+            queryset = queryset.prefetch_related(*nested_prefetch)
+        elif isinstance(child, serializers.SlugRelatedField) and '__' not in child.slug_field:
+            queryset = queryset.only(related_model._meta.pk.name, child.slug_field)
+        elif pk_only(child):
+            queryset = queryset.only(related_model._meta.pk.name)
+        prefetch.append(Prefetch(paths[-1], queryset=queryset))
+    return list(dict.fromkeys(select)), list({lookup.prefetch_to: lookup for lookup in prefetch}.values())
+
+
+_relation_plans = {}
+
+
+def class_relation_plan(serializer_class):
+    # Plan zależy tylko od klasy serializera - liczony raz na proces
+    plan = _relation_plans.get(serializer_class)
+    if plan is None:
+        plan = _relation_plans[serializer_class] = relation_plan(serializer_class())
+    return plan
+
+
+def apply_relations(queryset, plan):
+    select, prefetch = plan
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*[copy.copy(lookup) for lookup in prefetch])
+    return queryset
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin for GET requests:
+
+    - `?fields=id,name,address.city` keeps only the listed fields
+      (dotted names narrow nested serializers),
+    - `?expand=company,create_by` renders relations listed in
+      Meta.expandable_fields with their serializer instead of the pk.
+
+    Only the root serializer reads the request; writes always use all fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        params = request.query_params
+        if FIELDS_PARAM in params or EXPAND_PARAM in params:
+            fields = parse_paths(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+            narrow(self, fields, parse_paths(params.get(EXPAND_PARAM)))
+
+
+class RelationPlanMixin:
+    """
+    ViewSet mixin: `get_queryset` loads the relations read by the serializer
+    class (relation_plan) up front, so lists run a constant number of queries.
+    """
+
+    def get_queryset(self):
+        return apply_relations(super().get_queryset(), class_relation_plan(self.get_serializer_class()))
+
+
+class SparseFieldsMixin:
+    """
+    ViewSet mixin for ?fields= / ?expand=: relations are loaded for the
+    narrowed serializer instead of the whole class (only what is rendered,
+    expanded relations included); on `list` the queryset also reads only the
+    columns of the narrowed serializer.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not (FIELDS_PARAM in params or EXPAND_PARAM in params):
+            return queryset
+
+        serializer = self.get_serializer()
+        queryset = apply_relations(queryset.select_related(None).prefetch_related(None), relation_plan(serializer))
+        only = load_plan(serializer) if self.action == 'list' else None
+        if only is not None:
+            # Pola klucza kursora są potrzebne do zbudowania linku na następną stronę
+            ordering = getattr(self.paginator, 'cursor_ordering', ()) if self.paginator else ()
+            queryset = queryset.only(*only, *[field.lstrip('-') for field in ordering])
+        return queryset
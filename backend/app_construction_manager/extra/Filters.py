@@ -1,7 +1,13 @@
 import django_filters
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
 from datetime import datetime, timedelta
 
+from app_construction_manager.extra.Cache import get_versions, model_label
+
+NAMES_KEY = 'cm:names:{}:{}:{}'
+NAMES_TIMEOUT = 300
+
 
 class CustomDateRangeFilter(django_filters.Filter):
     def __init__(self, *args, param_name=None, **kwargs):
@@ -37,7 +43,25 @@ class BooleanInFilter(django_filters.BaseInFilter, django_filters.BooleanFilter)
             return qs.filter(**{f"{self.field_name}__in": bool_values})
         return qs
     
+def related_names(model, field):
+    """{value of `field`: pk} of a small related table (e.g. Group.name), cached until the model changes."""
+    key = NAMES_KEY.format(model_label(model), field, get_versions(model)[0])
+    names = cache.get(key)
+    if names is None:
+        names = dict(model._default_manager.values_list(field, 'pk'))
+        cache.set(key, names, NAMES_TIMEOUT)
+    return names
+
+
 class RelatedNameFilter(django_filters.Filter):
+    """
+    ?groups[]=a&groups[]=b - rows whose many-to-many relation has an object with
+    `related_field` containing any of the values (icontains).
+
+    Built as one correlated EXISTS over the M2M table, so neither the list nor
+    its count needs DISTINCT. A value equal to a known name that is not part of
+    any other name is resolved to its id up front (no join to the related table).
+    """
     def __init__(self, *args, param_name=None, related_field='name', **kwargs):
         self.related_field = related_field
         super().__init__(*args, **kwargs)
@@ -47,10 +71,22 @@ class RelatedNameFilter(django_filters.Filter):
         values = self.parent.request.GET.getlist(self.param_name)
         if not values:
             values = self.parent.request.GET.getlist(self.field_name)
+        if not values:
+            return qs
 
-        if values:
-            query = Q()
-            for val in values:
-                query |= Q(**{f"{self.field_name}__{self.related_field}__icontains": val})
-            return qs.filter(query).distinct()
-        return qs
\ No newline at end of file
+        field = qs.model._meta.get_field(self.field_name)
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        names = related_names(field.related_model, self.related_field)
+
+        ids, query = [], Q()
+        for val in values:
+            matches = [pk for name, pk in names.items() if val.casefold() in name.casefold()]
+            if val in names and matches == [names[val]]:
+                ids.append(names[val])
+            else:
+                query |= Q(**{f"{target}__{self.related_field}__icontains": val})
+        if ids:
+            query |= Q(**{f"{target}__in": ids})
+
+        rows = field.remote_field.through.objects.filter(query, **{source: OuterRef('pk')})
+        return qs.filter(Exists(rows))
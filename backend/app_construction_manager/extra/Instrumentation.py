@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.response import Response
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Database and phase timings of one request; SQL is kept only up to `max_sql` entries."""
+
+    def __init__(self, max_sql):
+        self.start = time.perf_counter()
+        self.max_sql = max_sql
+        self.db_time = 0.0
+        self.query_count = 0
+        self.sql = []
+        self.timings = {}
+        self.render_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.query_count += 1
+            if len(self.sql) < self.max_sql:
+                self.sql.append({'sql': sql, 'params': [str(param) for param in params or ()],
+                                 'ms': round(duration * 1000, 2)})
+
+    def add(self, name, duration):
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+
+@contextmanager
+def measure(name):
+    """Adds the block's duration to the current request's Server-Timing entry `name`."""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.add(name, time.perf_counter() - start)
+
+
+class SlowRequestLog:
+    """Bounded, thread-safe ring buffer of the most recent slow requests."""
+
+    def __init__(self, size):
+        self.entries = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+
+    def all(self):
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+slow_requests = SlowRequestLog(getattr(settings, 'SLOW_REQUEST_LOG_SIZE', 100))
+
+
+class ServerTimingMiddleware:
+    """
+    Adds `Server-Timing` (db, serialize, render, total) to responses under
+    SERVER_TIMING_PATH_PREFIX and stores requests slower than
+    SLOW_REQUEST_THRESHOLD_MS, with their SQL, in `slow_requests`.
+    Does not depend on DEBUG / connection.queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = getattr(settings, 'SERVER_TIMING_PATH_PREFIX', '/api/construction/manager/')
+        self.threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500) / 1000
+        self.max_sql = getattr(settings, 'SLOW_REQUEST_MAX_SQL', 50)
+
+    def __call__(self, request):
+        if not request.path.startswith(self.prefix):
+            return self.get_response(request)
+
+        metrics = RequestMetrics(self.max_sql)
+        token = _current.set(metrics)
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        end = time.perf_counter()
+        total = end - metrics.start
+        if metrics.render_start is not None:
+            metrics.add('render', end - metrics.render_start)
+
+        response['Server-Timing'] = self.header(metrics, total)
+        if total >= self.threshold:
+            slow_requests.add(self.entry(request, response, metrics, total))
+        return response
+
+    def process_template_response(self, request, response):
+        # Wywoływane tuż przed response.render() - od tej chwili liczymy czas renderowania
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_start = time.perf_counter()
+        return response
+
+    def header(self, metrics, total):
+        entries = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.query_count} queries"']
+        entries += [f'{name};dur={duration * 1000:.2f}' for name, duration in metrics.timings.items()]
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+    def entry(self, request, response, metrics, total):
+        user = getattr(request, 'user', None)
+        return {
+            'timestamp': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'user': user.pk if user is not None and user.is_authenticated else None,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'query_count': metrics.query_count,
+            'timings_ms': {name: round(duration * 1000, 2) for name, duration in metrics.timings.items()},
+            'sql': metrics.sql,
+        }
+
+
+class ServerTimingMixin:
+    """ViewSet mixin reporting serializer time of list/retrieve as `serialize`."""
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            with measure('serialize'):
+                data = serializer.data
+            return self.get_paginated_response(data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        with measure('serialize'):
+            data = serializer.data
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        with measure('serialize'):
+            data = serializer.data
+        return Response(data)
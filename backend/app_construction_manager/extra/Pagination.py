@@ -0,0 +1,230 @@
+import base64
+import json
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from app_construction_manager.extra.Cache import cached_count, estimated_count
+from app_construction_manager.extra.Queries import query_phase
+
+
+class CachedCountPaginator(DjangoPaginator):
+    """Django paginator whose COUNT(*) goes through the versioned count cache."""
+
+    @cached_property
+    def count(self):
+        with query_phase('count'):
+            return cached_count(self.object_list)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    PageNumberPagination with an opt-in keyset mode.
+
+    `?cursor=` (empty for the first page) switches to paging on `cursor_ordering`
+    with a `WHERE (created_at, id) < (...)` condition instead of OFFSET, so every
+    page costs one index seek no matter how deep it is.
+
+    In page mode `?count=exact|estimate|none` controls the total: exact counts are
+    cached until a write to the model, `estimate` reads table statistics and
+    `none` skips the count; in both of these modes `has_next` comes from
+    fetching `page_size + 1` rows.
+    """
+    django_paginator_class = CachedCountPaginator
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-created_at', '-id')
+    cursor_page_size = 15
+    invalid_cursor_message = 'Nieprawidłowy kursor.'
+    invalid_cursor_ordering_message = 'Tryb kursora obsługuje tylko ordering={} albo ordering={}.'
+    count_query_param = 'count'
+    count_modes = ('exact', 'estimate', 'none')
+
+    cursor_mode = False
+    count_mode = 'exact'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if self.cursor_mode:
+            return self.paginate_queryset_by_cursor(queryset, request)
+
+        self.count_mode = request.query_params.get(self.count_query_param, 'exact')
+        if self.count_mode not in self.count_modes:
+            self.count_mode = 'exact'
+        if self.count_mode == 'exact':
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_without_count(queryset, request)
+
+    def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return Response({
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            })
+        return Response({
+            'count': self.get_count(),
+            'has_next': self.has_next,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_count(self):
+        if self.count_mode == 'exact':
+            return self.page.paginator.count
+        return self.count
+
+    def get_next_link(self):
+        if self.cursor_mode:
+            if not self.has_next:
+                return None
+            return self.encode_cursor(self.page[-1], reverse=False)
+        if self.count_mode != 'exact':
+            if not self.has_next:
+                return None
+            return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            if not self.has_previous:
+                return None
+            return self.encode_cursor(self.page[0], reverse=True)
+        if self.count_mode != 'exact':
+            if self.page_number <= 1:
+                return None
+            url = self.request.build_absolute_uri()
+            if self.page_number == 2:
+                return remove_query_param(url, self.page_query_param)
+            return replace_query_param(url, self.page_query_param, self.page_number - 1)
+        return super().get_previous_link()
+
+    @property
+    def has_next(self):
+        if self.cursor_mode or self.count_mode != 'exact':
+            return self._has_next
+        return self.page.has_next()
+
+    @has_next.setter
+    def has_next(self, value):
+        self._has_next = value
+
+    # --- page mode without exact count ---
+
+    def paginate_queryset_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+            if self.page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise NotFound(self.invalid_page_message)
+
+        self.has_next = len(rows) > page_size
+        if self.count_mode == 'estimate':
+            with query_phase('count'):
+                self.count = estimated_count(queryset)
+        else:
+            self.count = None
+        self.page = rows[:page_size]
+        return self.page
+
+    # --- keyset mode ---
+
+    def get_cursor_ordering(self, request):
+        # Pozwalamy tylko odwrócić kierunek domyślnego klucza (np. ordering=created_at);
+        # inne sortowanie odrzucamy zamiast po cichu zwracać wiersze w innej kolejności
+        ordering = list(self.cursor_ordering)
+        requested = request.query_params.get('ordering')
+        if not requested or requested == ordering[0]:
+            return ordering
+        if requested == self.flip(ordering[0]):
+            return [self.flip(field) for field in ordering]
+        raise ValidationError({'ordering': [
+            self.invalid_cursor_ordering_message.format(ordering[0], self.flip(ordering[0]))
+        ]})
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request) or self.cursor_page_size
+        self.ordering = self.get_cursor_ordering(request)
+
+        position, reverse = self.decode_cursor(queryset.model, request.query_params[self.cursor_query_param])
+        ordering = [self.flip(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_condition(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def keyset_condition(self, ordering, position):
+        # (a, b) < (x, y)  ==>  a <= x AND (a < x OR (a = x AND b < y))
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+
+        first = ordering[0]
+        leading = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]})
+        return leading & condition
+
+    def encode_cursor(self, obj, reverse):
+        position = []
+        for field in self.ordering:
+            # Wiersz modelu albo słownik z .values() (extra/Compiled.py)
+            value = obj[field.lstrip('-')] if isinstance(obj, dict) else getattr(obj, field.lstrip('-'))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, model, cursor):
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, payload['p'])
+            ]
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return position, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f"-{field}"
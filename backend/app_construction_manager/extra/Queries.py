@@ -0,0 +1,220 @@
+import logging
+import re
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from rest_framework.response import Response
+
+logger = logging.getLogger('app_construction_manager.queries')
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+
+_phase = ContextVar('query_phase', default=None)
+
+
+@contextmanager
+def query_phase(name):
+    """Tags queries executed inside the block, e.g. the paginator count (see ExplainMixin)."""
+    token = _phase.set(name)
+    try:
+        yield
+    finally:
+        _phase.reset(token)
+
+
+class QueryCounter:
+    """
+    Records every query executed on a connection, also with DEBUG=False
+    (uses connection.execute_wrapper instead of connection.queries).
+
+        with QueryCounter() as counter:
+            client.get(url)
+        counter.count, counter.queries
+    """
+
+    def __init__(self, using='default', capture_stack=False):
+        self.connection = connections[using]
+        self.capture_stack = capture_stack
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'params': params,
+                'time': time.perf_counter() - start,
+                'phase': _phase.get(),
+                'stack': project_stack() if self.capture_stack else None,
+            })
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(query['time'] for query in self.queries)
+
+
+def project_stack():
+    # Tylko ramki z kodu projektu - bez Django, DRF i site-packages
+    base_dir = str(settings.BASE_DIR)
+    return [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir) and 'site-packages' not in frame.filename
+    ]
+
+
+def query_shape(sql):
+    # "IN (%s, %s, %s)" i "IN (%s)" to ten sam kształt zapytania
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+def find_repeated_queries(queries, threshold):
+    groups = defaultdict(list)
+    for query in queries:
+        groups[query_shape(query['sql'])].append(query)
+    return {shape: items for shape, items in groups.items() if len(items) >= threshold}
+
+
+@contextmanager
+def assert_max_queries(budget, using='default'):
+    """Fails when the block runs more than `budget` queries and lists them."""
+    with QueryCounter(using=using) as counter:
+        yield counter
+
+    if counter.count > budget:
+        executed = '\n'.join(f"{i}. {query['sql']}" for i, query in enumerate(counter.queries, start=1))
+        raise AssertionError(f"Expected at most {budget} queries, executed {counter.count}:\n{executed}")
+
+
+class NPlusOneDetectionMiddleware:
+    """
+    Dev-only: reports query shapes repeated at least NPLUSONE_THRESHOLD times
+    within one request (typical N+1) with the project stack trace of the first one.
+    Enabled by NPLUSONE_DETECTION (defaults to DEBUG).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_DETECTION', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        with QueryCounter(capture_stack=True) as counter:
+            response = self.get_response(request)
+
+        repeated = find_repeated_queries(counter.queries, self.threshold)
+        for shape, items in repeated.items():
+            stack = ''.join(traceback.format_list(items[0]['stack'] or []))
+            logger.warning(
+                "N+1: %s %s executed %d times\n%s\n%s",
+                request.method, request.path, len(items), shape, stack,
+            )
+        if repeated:
+            response['X-NPlusOne-Queries'] = str(sum(len(items) for items in repeated.values()))
+        return response
+
+
+def explain_sql(sql, params, using='default'):
+    """Database plan of one SQL statement as text (SHOWPLAN_TEXT on MSSQL, EXPLAIN elsewhere)."""
+    connection = connections[using]
+    rows = []
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'microsoft':
+                # mssql-django nie obsługuje QuerySet.explain()
+                cursor.execute('SET SHOWPLAN_TEXT ON')
+                try:
+                    cursor.execute(sql, params)
+                    while True:
+                        rows += cursor.fetchall()
+                        if not cursor.nextset():
+                            break
+                finally:
+                    cursor.execute('SET SHOWPLAN_TEXT OFF')
+            else:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+                rows = cursor.fetchall()
+    except DatabaseError as error:
+        return f"EXPLAIN niedostępny: {error}"
+
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(' '.join(str(value) for value in row) for row in rows)
+
+
+def json_params(params):
+    return [value if isinstance(value, (str, int, float, bool, type(None))) else str(value) for value in params or ()]
+
+
+class ExplainMixin:
+    """
+    `?_explain=1` on a list request of a staff user runs the same Filter /
+    search / ordering pipeline and pagination as `list`, but instead of rows
+    returns every executed SQL with params, time and the database plan.
+    A count answered from the count cache is run once more to show its plan.
+    """
+    explain_query_param = '_explain'
+
+    def list(self, request, *args, **kwargs):
+        if not (request.query_params.get(self.explain_query_param) and request.user.is_staff):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        with QueryCounter() as counter:
+            page = self.paginate_queryset(queryset)
+            if page is None:
+                list(queryset)
+
+        queries = []
+        for query in counter.queries:
+            # Po fazie paginatora, nie po treści SQL - wyszukiwanie też ma COUNT( w podzapytaniu
+            if query['phase'] == 'count':
+                kind = 'count'
+            else:
+                kind = 'page' if not any(item['kind'] == 'page' for item in queries) else 'related'
+            queries.append({'kind': kind, 'cached': False, **query})
+
+        paginator = self.paginator
+        exact_count = page is not None and not getattr(paginator, 'cursor_mode', False) and \
+            getattr(paginator, 'count_mode', 'exact') == 'exact'
+        if exact_count and not any(query['kind'] == 'count' for query in queries):
+            with QueryCounter() as count_counter:
+                queryset.count()
+            queries += [{'kind': 'count', 'cached': True, **query} for query in count_counter.queries]
+
+        return Response({
+            'vendor': connections['default'].vendor,
+            'total_ms': round(sum(query['time'] for query in queries) * 1000, 3),
+            'queries': [
+                {
+                    'kind': query['kind'],
+                    'cached': query['cached'],
+                    'sql': query['sql'],
+                    'params': json_params(query['params']),
+                    'time_ms': round(query['time'] * 1000, 3),
+                    'plan': explain_sql(query['sql'], query['params']),
+                }
+                for query in queries
+            ],
+        })
@@ -0,0 +1,220 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from app_construction_manager.extra.Cache import (
+    dependencies, get_last_modified, get_versions, model_label, versioned_cache_enabled,
+)
+from app_construction_manager.extra.Instrumentation import measure
+from app_construction_manager.extra.Renderers import ORJSONRenderer
+from app_construction_manager.extra.SingleFlight import single_flight
+from global_project.cache import LocalLRUBackend
+
+LIST_KEY = 'cm:list:{}:{}:{}'
+DEFAULTS = {'BACKEND': 'local', 'MAX_ENTRIES': 1000, 'TIMEOUT': 300, 'ALIAS': 'default'}
+
+
+class SharedBackend:
+    """Django cache (CACHES[alias]) shared by all workers; eviction is left to the cache server (e.g. Redis allkeys-lru)."""
+
+    def __init__(self, alias, timeout):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def clear(self):
+        # Wpisy wygasają same lub przestają być trafiane po podbiciu wersji modeli
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class ListResponseCache:
+    """Keeps serialized list responses; counts hits and misses of this process."""
+
+    def __init__(self, config):
+        self.config = config
+        if config['BACKEND'] == 'shared':
+            self.backend = SharedBackend(config['ALIAS'], config['TIMEOUT'])
+        else:
+            self.backend = LocalLRUBackend(config['MAX_ENTRIES'], config['TIMEOUT'])
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def clear(self):
+        self.backend.clear()
+        with self.lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': self.config['BACKEND'],
+            'entries': len(self.backend),
+            'max_entries': self.config['MAX_ENTRIES'],
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else None,
+        }
+
+
+_list_cache = None
+
+
+def get_list_cache():
+    global _list_cache
+    config = {**DEFAULTS, **getattr(settings, 'LIST_RESPONSE_CACHE', {})}
+    if _list_cache is None or _list_cache.config != config:
+        _list_cache = ListResponseCache(config)
+    return _list_cache
+
+
+def plain(data):
+    # ReturnDict/ReturnList trzymają referencję do serializera - do cache trafiają zwykłe dict/list
+    if isinstance(data, dict):
+        return {key: plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [plain(value) for value in data]
+    return data
+
+
+def normalized_query(request):
+    # Kolejność parametrów w URL nie ma znaczenia, kolejność wartości jednego parametru (np. zakres dat) ma
+    return sorted((key, tuple(values)) for key, values in request.query_params.lists())
+
+
+class CachedListMixin:
+    """
+    Caches `list` responses per normalized query string and the user's company.
+
+    The key contains version counters of the model and its related models
+    (bumped by signals.py and bulk writes), so any write invalidates it.
+    Concurrent misses of the same key share one execution (SingleFlight);
+    the requests that waited get `X-Cache: COALESCED`. Without a version store
+    shared by all workers (see `versioned_cache_enabled`) the cache is bypassed.
+    """
+
+    def list_cache_key(self, request):
+        model = self.queryset.model
+        company = getattr(request.user, 'user_company_id', None)
+        raw = f"{request.get_host()}|{request.path}|{company}|{normalized_query(request)!r}"
+        versions = '.'.join(str(version) for version in get_versions(*dependencies(model)))
+        return LIST_KEY.format(model_label(model), versions, hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        if not versioned_cache_enabled():
+            response = super().list(request, *args, **kwargs)
+            response['X-Cache'] = 'BYPASS'
+            return response
+
+        cache = get_list_cache()
+        key = self.list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        leader = False
+
+        def compute():
+            nonlocal leader
+            leader = True
+            response = super(CachedListMixin, self).list(request, *args, **kwargs)
+            data = plain(response.data)
+            if response.status_code == 200:
+                cache.set(key, data)
+            return response.status_code, data
+
+        # Identyczne równoczesne requesty (ten sam klucz: parametry, firma, wersje) czekają na jedno wykonanie
+        status_code, data = single_flight(key, compute)
+        return Response(data, status=status_code, headers={'X-Cache': 'MISS' if leader else 'COALESCED'})
+
+
+class ConditionalGetMixin:
+    """
+    Weak ETag and Last-Modified for `list` and `retrieve`; a matching
+    If-None-Match / If-Modified-Since gets 304 before anything is serialized.
+
+    The list validators come from the cache alone: the ETag hashes the model
+    versions (bumped by every write, including deletes and changes of related
+    rows) with the query params, Last-Modified is the time of the last write
+    to those models. A revalidated list therefore costs no query beyond
+    authentication. Without a version store shared by the workers the ETag
+    is a hash of the serialized response instead. `Cache-Control: no-cache`
+    makes the browser revalidate every refetch instead of guessing freshness.
+    """
+    last_modified_field = 'updated_at'
+
+    def etag(self, request, *parts):
+        model = self.queryset.model
+        company = getattr(request.user, 'user_company_id', None)
+        raw = f"{request.path}|{company}|{get_versions(*dependencies(model))}|{parts!r}"
+        return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+    def conditional_response(self, request, etag, last_modified, respond):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = respond()
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization', 'Accept'])
+        return response
+
+    def content_conditional_response(self, request, respond):
+        response = respond()
+        if response.status_code != 200:
+            return response
+        digest = hashlib.sha1(ORJSONRenderer().render(response.data)).hexdigest()
+        return self.conditional_response(request, f'W/"{digest}"', None, lambda: response)
+
+    def list(self, request, *args, **kwargs):
+        def respond():
+            return super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+
+        if not versioned_cache_enabled():
+            return self.content_conditional_response(request, respond)
+
+        etag = self.etag(request, normalized_query(request), request.accepted_media_type)
+        last_modified = get_last_modified(*dependencies(self.queryset.model))
+        return self.conditional_response(request, etag, last_modified, respond)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        etag = self.etag(request, instance.pk, last_modified)
+
+        def respond():
+            serializer = self.get_serializer(instance)
+            with measure('serialize'):
+                data = serializer.data
+            return Response(data)
+
+        return self.conditional_response(request, etag, last_modified, respond)
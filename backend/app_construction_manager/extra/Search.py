@@ -0,0 +1,396 @@
+import math
+import re
+import unicodedata
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+from rest_framework.fields import CharField
+
+from app_construction_manager.extra.Cache import bump_version
+
+# model -> {ścieżka pola tekstowego: waga}; wypełniane w signals.py przez register()
+REGISTRY = {}
+# model -> {'numeric': [pola liczbowe], 'boolean': pole logiczne}
+TYPED_FIELDS = {}
+
+SIMILARITY = 0.6
+WORD_RE = re.compile(r'\w+')
+TRANSLITERATION = str.maketrans({'ł': 'l'})
+
+NUMBER = r'-?\d+(?:\.\d+)?'
+NUMBER_RE = re.compile(rf'^{NUMBER}$')
+RANGE_RE = re.compile(rf'^({NUMBER})(?:\.\.|-)({NUMBER})$')
+COMPARISON_RE = re.compile(rf'^(<=|>=|<|>)({NUMBER})$')
+COMPARISON_LOOKUPS = {'<': 'lt', '<=': 'lte', '>': 'gt', '>=': 'gte'}
+QUALIFIED_RE = re.compile(r'^(\w+?)(:|=|<=|>=|<|>)(\S+)$')
+BOOLEANS = {'true': True, 'tak': True, 'false': False, 'nie': False}
+INTEGER_TYPES = ('AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+                 'PositiveIntegerField', 'PositiveSmallIntegerField')
+
+
+def register(model, fields, numeric=(), boolean=None):
+    REGISTRY[model] = dict(fields)
+    TYPED_FIELDS[model] = {'numeric': list(numeric), 'boolean': boolean}
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text).lower().translate(TRANSLITERATION))
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def split_words(text):
+    return WORD_RE.findall(normalize(text))
+
+
+def trigrams(word, prefix=False):
+    # Słowo z zapytania nie ma końcowej spacji - "krak" pasuje wtedy do "krakow"
+    padded = f"  {word}" if prefix else f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def resolve(instance, path):
+    value = instance
+    for part in path.split('__'):
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+def tokens(instance, fields):
+    """{trigram: weight} of the indexed fields; also used by the backfill in migration 0005 (historical models)."""
+    weights = {}
+    for path, weight in fields.items():
+        value = resolve(instance, path)
+        if value is None or isinstance(value, bool):
+            continue
+        for word in split_words(value):
+            for token in trigrams(word):
+                weights[token] = max(weights.get(token, 0), weight)
+    return weights
+
+
+def substring_condition(model, term):
+    condition = Q()
+    for path in REGISTRY[model]:
+        condition |= Q(**{f"{path}__icontains": term})
+    return condition
+
+
+def infix_trigrams(word):
+    # Trigramy z wnętrza słowa - "ars" trafia w "warszawa", "6789" w "48123456789"
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class NgramSearchBackend:
+    """
+    Trigram inverted index stored in SearchToken, works on every database.
+
+    Each query word matches when at least `SIMILARITY` of its prefix trigrams are
+    in the object's index (prefix matching and typo tolerance) or all of its inner
+    trigrams are (infix matching, like SearchFilter's icontains). Rows created
+    after the last indexed one (bulk_create without indexing) fall back to
+    icontains; the pk range keeps that fallback off the indexed rows. Results are
+    ranked by the summed field weights of matched trigrams.
+    """
+
+    def tokens_for(self, instance):
+        return tokens(instance, REGISTRY[type(instance)])
+
+    def index(self, instances):
+        from app_construction_manager.models import SearchToken
+
+        instances = [instance for instance in instances if type(instance) in REGISTRY]
+        if not instances:
+            return
+        label = instances[0]._meta.label_lower
+        rows = [
+            SearchToken(model_label=label, object_id=instance.pk, token=token, weight=weight)
+            for instance in instances
+            for token, weight in self.tokens_for(instance).items()
+        ]
+        with transaction.atomic():
+            SearchToken.objects.filter(model_label=label, object_id__in=[instance.pk for instance in instances]).delete()
+            SearchToken.objects.bulk_create(rows, batch_size=500)
+        # Wyniki wyszukiwania (i zliczenia w cache) zależą od indeksu
+        bump_version(type(instances[0]))
+
+    def remove(self, model, pks):
+        from app_construction_manager.models import SearchToken
+
+        SearchToken.objects.filter(model_label=model._meta.label_lower, object_id__in=list(pks)).delete()
+        bump_version(model)
+
+    def clear(self, model):
+        from app_construction_manager.models import SearchToken
+
+        SearchToken.objects.filter(model_label=model._meta.label_lower).delete()
+        bump_version(model)
+
+    def word_condition(self, model, word):
+        return Q(pk__in=self.word_matches(model._meta.label_lower, word)) | self.unindexed_condition(model, word)
+
+    def term_condition(self, model, term):
+        condition = Q()
+        for word in split_words(term):
+            condition &= Q(pk__in=self.word_matches(model._meta.label_lower, word))
+        return condition | self.unindexed_condition(model, term)
+
+    def unindexed_condition(self, model, term):
+        from app_construction_manager.models import SearchToken
+
+        # Seek po (model_label, object_id) i zakres pk - icontains tylko na wierszach spoza indeksu
+        last_indexed = (
+            SearchToken.objects.filter(model_label=model._meta.label_lower)
+            .order_by('-object_id').values('object_id')[:1]
+        )
+        return Q(pk__gt=Coalesce(Subquery(last_indexed), Value(0))) & substring_condition(model, term)
+
+    def word_matches(self, label, word):
+        from app_construction_manager.models import SearchToken
+
+        grams = trigrams(word, prefix=True)
+        required = len(grams) if len(word) <= 3 else math.ceil(len(grams) * SIMILARITY)
+        inner = infix_trigrams(word)
+        hits = Q(prefix_hits__gte=required)
+        if inner:
+            hits |= Q(inner_hits__gte=len(inner))
+        return (
+            SearchToken.objects
+            .filter(model_label=label, token__in=grams | inner)
+            .values('object_id')
+            .annotate(
+                prefix_hits=Count('token', filter=Q(token__in=grams)),
+                inner_hits=Count('token', filter=Q(token__in=inner)) if inner else Value(0),
+            )
+            .filter(hits)
+            .values('object_id')
+        )
+
+    def rank(self, label, grams):
+        from app_construction_manager.models import SearchToken
+
+        return Subquery(
+            SearchToken.objects
+            .filter(model_label=label, object_id=OuterRef('pk'), token__in=grams)
+            .values('object_id')
+            .annotate(rank=Sum('weight'))
+            .values('rank'),
+            output_field=IntegerField(),
+        )
+
+    def search(self, queryset, terms, ranked=True):
+        label = queryset.model._meta.label_lower
+        words = [word for term in terms for word in split_words(term)]
+        if not words:
+            return queryset
+
+        for term in terms:
+            queryset = queryset.filter(self.term_condition(queryset.model, term))
+
+        if ranked:
+            grams = set().union(*(trigrams(word, prefix=True) for word in words))
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.annotate(search_rank=self.rank(label, grams)).order_by(
+                F('search_rank').desc(nulls_last=True), *ordering
+            )
+        return queryset
+
+
+class MssqlFullTextSearchBackend(NgramSearchBackend):
+    """
+    SQL Server full-text search (CONTAINSTABLE, prefix terms, RANK).
+
+    Needs the full-text indexes from migration 0006; where they are missing it
+    uses the trigram index alone. Otherwise a row matches the full-text query or
+    the trigram conditions (typos, infixes) in the same statement, so there is
+    no pre-query; rows found only by trigrams rank last.
+    """
+    _active = {}
+
+    def has_fulltext(self, table):
+        if table not in self._active:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT OBJECTPROPERTYEX(OBJECT_ID(%s), 'TableHasActiveFulltextIndex')", [table])
+                row = cursor.fetchone()
+            self._active[table] = bool(row and row[0])
+        return self._active[table]
+
+    def fulltext_tables(self, model):
+        # {ścieżka do klucza: (model, [kolumny])} np. {'pk': (Company, [...]), 'address': (Address, [...])}
+        tables = {}
+        for path in REGISTRY[model]:
+            *relation, name = path.split('__')
+            target = model
+            for part in relation:
+                target = target._meta.get_field(part).related_model
+            field = target._meta.get_field(name)
+            if field.get_internal_type() not in ('CharField', 'TextField', 'EmailField'):
+                continue
+            key = '__'.join(relation) or 'pk'
+            tables.setdefault(key, (target, []))[1].append(field.column)
+        return tables
+
+    def search(self, queryset, terms, ranked=True):
+        words = [word for term in terms for word in split_words(term)]
+        if not words:
+            return queryset
+
+        tables = self.fulltext_tables(queryset.model)
+        if not tables or not all(self.has_fulltext(target._meta.db_table) for target, _ in tables.values()):
+            return super().search(queryset, terms, ranked)
+
+        condition = ' AND '.join(f'"{word}*"' for word in words)
+        matches = Q()
+        ranks = []
+        for key, (target, columns) in tables.items():
+            table = connection.ops.quote_name(target._meta.db_table)
+            columns = ', '.join(connection.ops.quote_name(column) for column in columns)
+            source = f"CONTAINSTABLE({table}, ({columns}), %s)"
+            outer = queryset.model._meta.pk.column if key == 'pk' else queryset.model._meta.get_field(key).column
+            outer = f"{connection.ops.quote_name(queryset.model._meta.db_table)}.{connection.ops.quote_name(outer)}"
+
+            matches |= Q(**{f"{key}__in": RawSQL(f"SELECT [KEY] FROM {source}", [condition])})
+            ranks.append(RawSQL(f"COALESCE((SELECT [RANK] FROM {source} ft WHERE ft.[KEY] = {outer}), 0)", [condition]))
+
+        trigram = Q()
+        for term in terms:
+            trigram &= self.term_condition(queryset.model, term)
+        found = queryset.filter(matches | trigram)
+
+        if ranked:
+            rank = ranks[0]
+            for expression in ranks[1:]:
+                rank = rank + expression
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            found = found.annotate(search_rank=rank).order_by(F('search_rank').desc(), *ordering)
+        return found
+
+
+def get_search_backend():
+    path = getattr(settings, 'SEARCH_BACKEND', None)
+    if path is None:
+        path = (
+            'app_construction_manager.extra.Search.MssqlFullTextSearchBackend'
+            if connection.vendor == 'microsoft'
+            else 'app_construction_manager.extra.Search.NgramSearchBackend'
+        )
+    return import_string(path)()
+
+
+class SearchParser:
+    """
+    Splits search terms by type so that each one hits only the columns it can match:
+
+    - `120`, `99.5`          -> equality on the numeric fields (integers also match text),
+    - `100-200`, `100..200`  -> range on the numeric fields (`a-b` on a model with
+                                only `id` also matches as text, e.g. postal codes),
+    - `>100`, `<=250`        -> comparison on the numeric fields,
+    - `usable_area_m2>100`, `price_net:100-200` -> the same, limited to one numeric field,
+    - `true`/`tak`, `false`/`nie` -> the boolean field,
+    - anything else          -> the text search backend.
+    """
+
+    def __init__(self, model, backend, numeric=None):
+        self.model = model
+        self.backend = backend
+        self.numeric = TYPED_FIELDS.get(model, {}).get('numeric', []) if numeric is None else numeric
+        self.boolean = TYPED_FIELDS.get(model, {}).get('boolean') if numeric is None else None
+        self.qualified = numeric is not None
+
+    def parse(self, terms):
+        """Returns (text terms for the backend, Q for the typed terms)."""
+        text, condition = [], Q()
+        for term in terms:
+            typed = self.typed_condition(term.lower())
+            if typed is None:
+                text.append(term)
+            else:
+                condition &= typed
+        return text, condition
+
+    def typed_condition(self, term):
+        if self.boolean and term in BOOLEANS:
+            return Q(**{self.boolean: BOOLEANS[term]})
+        if not self.numeric:
+            return None
+
+        match = QUALIFIED_RE.match(term)
+        if match and match.group(1) in self.numeric:
+            field, operator, value = match.groups()
+            if operator in COMPARISON_LOOKUPS:
+                value = operator + value
+            return SearchParser(self.model, self.backend, numeric=[field]).typed_condition(value)
+
+        match = RANGE_RE.match(term)
+        if match:
+            low, high = sorted((Decimal(match.group(1)), Decimal(match.group(2))))
+            condition = self.numeric_condition('range', (low, high))
+            if '..' not in term and not self.qualified and not any(name != 'id' for name in self.numeric):
+                # "90-950" to raczej kod pocztowy albo numer telefonu niż zakres samych id
+                condition |= self.backend.term_condition(self.model, term)
+            return condition
+
+        match = COMPARISON_RE.match(term)
+        if match:
+            return self.numeric_condition(COMPARISON_LOOKUPS[match.group(1)], Decimal(match.group(2)))
+
+        if NUMBER_RE.match(term):
+            condition = self.numeric_condition('exact', Decimal(term))
+            if '.' not in term:
+                # Liczby występują też w nazwach ("Dom Marzenie 5")
+                condition |= self.backend.word_condition(self.model, term.lstrip('-'))
+            return condition
+        return None
+
+    def numeric_condition(self, lookup, value):
+        condition = Q()
+        for name in self.numeric:
+            field = self.model._meta.get_field(name)
+            values = value if isinstance(value, tuple) else (value,)
+            if lookup == 'exact' and field.get_internal_type() in INTEGER_TYPES and values[0] % 1:
+                continue
+            converted = tuple(
+                int(item) if field.get_internal_type() in INTEGER_TYPES and lookup == 'exact' else float(item)
+                for item in values
+            )
+            condition |= Q(**{f"{name}__{lookup}": converted if lookup == 'range' else converted[0]})
+        # Żadna kolumna nie może mieć takiej wartości -> pusty wynik zamiast braku filtra
+        return condition if condition else Q(pk__in=[])
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on models registered in REGISTRY.
+    Numeric and boolean terms are handled by SearchParser, the remaining text by
+    the search backend. Without an explicit ?ordering= the results come back ranked.
+    """
+
+    def get_search_terms(self, request):
+        value = request.query_params.get(self.search_param, '')
+        value = CharField(trim_whitespace=False, allow_blank=True).run_validation(value)
+        # Polski przecinek dziesiętny ("1234,50") nie może rozdzielać frazy
+        return filters.search_smart_split(re.sub(r'(?<=\d),(?=\d)', '.', value))
+
+    def filter_queryset(self, request, queryset, view):
+        if queryset.model not in REGISTRY:
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        backend = get_search_backend()
+        text, condition = SearchParser(queryset.model, backend).parse(terms)
+        queryset = queryset.filter(condition)
+        if not text:
+            return queryset
+
+        ranked = not request.query_params.get('ordering')
+        return backend.search(queryset, text, ranked=ranked)
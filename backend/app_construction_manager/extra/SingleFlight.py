@@ -0,0 +1,103 @@
+import threading
+
+from django.conf import settings
+
+DEFAULTS = {'ENABLED': True, 'TIMEOUT': 10}
+
+
+class Call:
+    """One in-flight execution; waiting threads read its result or error once `done` is set."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key within this process: the
+    first caller (leader) runs the function, callers arriving while it runs
+    (followers) wait for its result or re-raise its exception.
+
+    A follower that waits longer than `timeout` seconds stops waiting and
+    runs the function itself, so one slow query never blocks a whole queue.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self.lock:
+                    self.timeouts += 1
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def clear(self):
+        # Tylko liczniki - trwające wywołania kończą się normalnie
+        with self.lock:
+            self.leaders = self.coalesced = self.timeouts = self.errors = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.leaders + self.coalesced
+            return {
+                'in_flight': len(self.calls),
+                'timeout': self.timeout,
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'timeouts': self.timeouts,
+                'errors': self.errors,
+                'coalesced_ratio': round(self.coalesced / total, 3) if total else None,
+            }
+
+
+_flight = None
+
+
+def get_single_flight():
+    """Process-wide SingleFlight, None when SINGLE_FLIGHT['ENABLED'] is off."""
+    global _flight
+    config = {**DEFAULTS, **getattr(settings, 'SINGLE_FLIGHT', {})}
+    if not config['ENABLED']:
+        return None
+    if _flight is None or _flight.timeout != config['TIMEOUT']:
+        _flight = SingleFlight(config['TIMEOUT'])
+    return _flight
+
+
+def single_flight(key, fn):
+    flight = get_single_flight()
+    return fn() if flight is None else flight.do(key, fn)
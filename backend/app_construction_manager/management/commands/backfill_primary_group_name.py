@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from app_construction_manager.extra.Cache import bump_version
+from global_auth.models import update_primary_group_name
+
+
+class Command(BaseCommand):
+    help = "Uzupełnia CustomUser.primary_group_name (pierwsza alfabetycznie grupa) dla istniejących użytkowników"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=10000, help="Zakres kluczy głównych na jeden UPDATE")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        chunk_size = options['chunk_size']
+        bounds = User.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write("Brak użytkowników")
+            return
+
+        # Zakresy kluczy zamiast jednego UPDATE całej tabeli - krótkie transakcje i blokady
+        total = 0
+        for start in range(bounds['first'], bounds['last'] + 1, chunk_size):
+            total += update_primary_group_name(User.objects.filter(pk__gte=start, pk__lt=start + chunk_size))
+        bump_version(User)
+        self.stdout.write(f"{User._meta.label}: {total}")
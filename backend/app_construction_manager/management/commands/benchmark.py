@@ -0,0 +1,129 @@
+import json
+import os
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_construction_manager.benchmarks.dataset import OWNER_EMAIL, dump_snapshot, load_snapshot, seed_dataset
+from app_construction_manager.benchmarks.runner import compare, run_scenario
+from app_construction_manager.benchmarks.scenarios import PAIRED_SCENARIOS, build_scenarios
+from app_construction_manager.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark endpointów API na wygenerowanym zbiorze danych (SQLite). "
+        "Uruchamiać z --settings=global_project.benchmark_settings"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=10000)
+        parser.add_argument('--products-per-company', type=int, default=100)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--reseed', action='store_true', help="Czyści bazę i generuje dane od nowa")
+        parser.add_argument('--skip-search-index', action='store_true')
+        parser.add_argument('--workers', type=int, default=None, help="Liczba procesów generujących dane")
+        parser.add_argument('--snapshot', metavar='PATH',
+                            help="Wczytuje dane ze snapshotu (seed --dump); gdy plik nie istnieje - zapisuje go")
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--only', help="Wyrażenie regularne na nazwy scenariuszy, np. 'products:(list|search)'")
+        parser.add_argument('--output', default='benchmark.json')
+        parser.add_argument('--baseline', help="Poprzedni wynik (JSON) do porównania")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Dopuszczalny wzrost, 0.2 = 20%%")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("Benchmark czyści i wypełnia bazę - uruchom z --settings=global_project.benchmark_settings")
+
+        call_command('migrate', verbosity=0)
+        user = self.prepare_dataset(options)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        scenarios = build_scenarios(client)
+        if options['only']:
+            pattern = re.compile(options['only'])
+            scenarios = [item for item in scenarios if pattern.search(item['name'])]
+
+        results = {}
+        for item in scenarios:
+            results[item['name']] = result = run_scenario(client, item, repeat=options['repeat'])
+            self.stdout.write(
+                f"{item['name']:<55} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+                f"{result['queries']:>3} q  {result['peak_memory_kb']:>9.1f} KiB"
+            )
+
+        # Skompilowany serializer względem DRF, uwierzytelnienie z cache względem bez cache
+        for name, result in results.items():
+            for suffix, label in PAIRED_SCENARIOS:
+                reference = results.get(f'{name}{suffix}')
+                if reference and reference['p50_ms']:
+                    self.stdout.write(f"{name:<55} {label} p50 {result['p50_ms'] / reference['p50_ms']:>6.2f}x")
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'companies': options['companies'],
+                'products_per_company': options['products_per_company'],
+                'users': options['users'],
+                'seed': options['seed'],
+                'repeat': options['repeat'],
+            },
+            'scenarios': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        self.stdout.write(f"Zapisano {options['output']}")
+
+        if options['baseline']:
+            self.check_regressions(options['baseline'], report, options['threshold'])
+
+    def prepare_dataset(self, options):
+        User = get_user_model()
+        if options['reseed']:
+            call_command('flush', interactive=False, verbosity=0)
+
+        user = User.objects.filter(email=OWNER_EMAIL).first()
+        if user is None:
+            snapshot = options['snapshot']
+            if snapshot and os.path.exists(snapshot):
+                self.stdout.write(f"▶ Wczytuję snapshot {snapshot}...")
+                load_snapshot(snapshot, log=self.stdout.write)
+                return User.objects.get(email=OWNER_EMAIL)
+
+            self.stdout.write("▶ Generuję dane...")
+            user = seed_dataset(
+                options['companies'], options['products_per_company'], users=options['users'],
+                seed=options['seed'], index_search=not options['skip_search_index'],
+                workers=options['workers'], log=self.stdout.write,
+            )
+            if snapshot:
+                dump_snapshot(snapshot, log=self.stdout.write)
+            return user
+
+        if Company.objects.count() != options['companies']:
+            raise CommandError("Baza zawiera inny zbiór danych - użyj --reseed")
+        return user
+
+    def check_regressions(self, path, report, threshold):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['meta'].get('companies') != report['meta']['companies'] or \
+                baseline['meta'].get('products_per_company') != report['meta']['products_per_company']:
+            self.stderr.write("Uwaga: baseline wygenerowany dla innego rozmiaru danych")
+
+        regressions = compare(baseline, report, threshold)
+        for item in regressions:
+            self.stderr.write(f"{item['scenario']}: {item['metric']} {item['baseline']} -> {item['current']}")
+        if regressions:
+            raise CommandError(f"{len(regressions)} regresji powyżej progu {threshold:.0%}")
+        self.stdout.write(self.style.SUCCESS("Brak regresji względem baseline"))
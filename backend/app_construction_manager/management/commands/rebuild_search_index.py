@@ -0,0 +1,29 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from app_construction_manager.extra.Search import REGISTRY, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Przebudowuje indeks wyszukiwarki (SearchToken) dla modeli zarejestrowanych w extra/Search.py"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        chunk_size = options['chunk_size']
+
+        for model, fields in REGISTRY.items():
+            backend.clear(model)
+            related = {path.rsplit('__', 1)[0] for path in fields if '__' in path}
+            rows = model.objects.select_related(*related).order_by('pk').iterator(chunk_size=chunk_size)
+            total = 0
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                backend.index(chunk)
+                total += len(chunk)
+            self.stdout.write(f"{model._meta.label}: {total}")
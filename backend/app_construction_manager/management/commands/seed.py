@@ -0,0 +1,47 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from app_construction_manager.benchmarks.dataset import dump_snapshot, load_snapshot, seed_dataset
+from app_construction_manager.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        "Generuje dane testowe (firmy, adresy, produkty, użytkownicy, grupy) w zadanej skali "
+        "albo wczytuje / zapisuje binarny snapshot bazy"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1000)
+        parser.add_argument('--products-per-company', type=int, default=10)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=0, help="Ten sam seed - te same dane")
+        parser.add_argument('--workers', type=int, default=None, help="Liczba procesów generujących dane")
+        parser.add_argument('--skip-search-index', action='store_true')
+        parser.add_argument('--flush', action='store_true', help="Czyści bazę przed generowaniem / wczytaniem")
+        parser.add_argument('--dump', metavar='PATH', help="Zapisuje snapshot po wygenerowaniu danych")
+        parser.add_argument('--load', metavar='PATH', help="Wczytuje snapshot zamiast generować dane")
+
+    def handle(self, *args, **options):
+        if options['flush']:
+            call_command('flush', interactive=False, verbosity=0)
+        elif Company.objects.exists():
+            # Dane mają stałe unikalne wartości - drugi przebieg kończył się IntegrityError
+            raise CommandError("Dane wczytujemy / generujemy do pustej bazy - użyj --flush")
+
+        start = time.perf_counter()
+        if options['load']:
+            load_snapshot(options['load'], log=self.stdout.write)
+        else:
+            seed_dataset(
+                options['companies'], options['products_per_company'], users=options['users'],
+                seed=options['seed'], index_search=not options['skip_search_index'],
+                workers=options['workers'], log=self.stdout.write,
+            )
+        self.stdout.write(f"Dane gotowe w {time.perf_counter() - start:.1f} s")
+
+        if options['dump']:
+            dump_snapshot(options['dump'], log=self.stdout.write)
+            self.stdout.write(f"Zapisano snapshot {options['dump']}")
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_construction_manager", "0003_product_description_alter_product_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(fields=["-created_at", "-id"], name="company_created_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(fields=["is_active", "-created_at"], name="company_active_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["-created_at", "-id"], name="product_created_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["company", "-created_at"], name="product_company_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["is_active", "-created_at"], name="product_active_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["usable_area_m2"], name="product_usable_area_idx"),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:35
+
+from django.db import migrations, models
+
+
+def build_search_index(apps, schema_editor):
+    # Istniejące firmy i produkty muszą być wyszukiwalne od razu po wdrożeniu;
+    # później indeks utrzymują signals.py, a rebuild_search_index służy do ponownej synchronizacji
+    from app_construction_manager.extra.Search import REGISTRY, tokens
+
+    SearchToken = apps.get_model("app_construction_manager", "SearchToken")
+    for model, fields in REGISTRY.items():
+        historical = apps.get_model(model._meta.label)
+        related = {path.rsplit("__", 1)[0] for path in fields if "__" in path}
+        rows = []
+        for instance in historical.objects.select_related(*related).order_by("pk").iterator(chunk_size=1000):
+            rows += [
+                SearchToken(model_label=model._meta.label_lower, object_id=instance.pk, token=token, weight=weight)
+                for token, weight in tokens(instance, fields).items()
+            ]
+            if len(rows) >= 5000:
+                SearchToken.objects.bulk_create(rows, batch_size=500)
+                rows = []
+        SearchToken.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_construction_manager", "0004_company_product_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_label", models.CharField(max_length=64)),
+                ("object_id", models.BigIntegerField()),
+                ("token", models.CharField(max_length=3)),
+                ("weight", models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["model_label", "token", "object_id"],
+                        name="searchtoken_lookup_idx",
+                    ),
+                    models.Index(
+                        fields=["model_label", "object_id"],
+                        name="searchtoken_object_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Full-text indexes for MssqlFullTextSearchBackend (extra/Search.py).
+# Runs only on SQL Server with Full-Text Search installed; other databases
+# use the SearchToken trigram index.
+
+from django.db import migrations
+
+CATALOG = "construction_manager_catalog"
+
+FULLTEXT_COLUMNS = {
+    "app_construction_manager_company": ["name", "email", "phone_number_1", "vat_id", "regon_id"],
+    "app_construction_manager_address": ["state", "city", "postal_code"],
+    "app_construction_manager_product": ["name", "description"],
+}
+
+
+def fulltext_available(schema_editor):
+    if schema_editor.connection.vendor != "microsoft":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')")
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    if not fulltext_available(schema_editor):
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{CATALOG}') "
+            f"CREATE FULLTEXT CATALOG {CATALOG} WITH ACCENT_SENSITIVITY = OFF"
+        )
+        for table, columns in FULLTEXT_COLUMNS.items():
+            # KEY INDEX musi wskazywać na unikalny indeks - bierzemy nazwę klucza głównego
+            cursor.execute(
+                "SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(%s) AND is_primary_key = 1",
+                [table],
+            )
+            primary_key = cursor.fetchone()[0]
+            cursor.execute(
+                f"CREATE FULLTEXT INDEX ON [{table}] ({', '.join(f'[{column}]' for column in columns)}) "
+                f"KEY INDEX [{primary_key}] ON {CATALOG} WITH CHANGE_TRACKING AUTO"
+            )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if not fulltext_available(schema_editor):
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in FULLTEXT_COLUMNS:
+            cursor.execute(
+                f"IF EXISTS (SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{table}')) "
+                f"DROP FULLTEXT INDEX ON [{table}]"
+            )
+        cursor.execute(
+            f"IF EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{CATALOG}') "
+            f"DROP FULLTEXT CATALOG {CATALOG}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE FULLTEXT INDEX nie może działać wewnątrz transakcji
+    atomic = False
+
+    dependencies = [
+        ("app_construction_manager", "0005_searchtoken"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
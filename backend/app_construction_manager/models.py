@@ -30,6 +30,13 @@ class Company(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     create_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT)
 
+    class Meta:
+        # Ścieżki dostępu z controllers/Company.py: domyślne sortowanie, kursor i filtr is_active[]
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='company_created_id_idx'),
+            models.Index(fields=['is_active', '-created_at'], name='company_active_created_idx'),
+        ]
+
     def __str__(self):
         return str(self.id) + " " + str(self.name) 
     
@@ -48,5 +55,31 @@ class Product(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     create_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT)
 
+    class Meta:
+        # Ścieżki dostępu z controllers/Products.py: sortowanie, produkty firmy, is_active, zakres powierzchni
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+            models.Index(fields=['company', '-created_at'], name='product_company_created_idx'),
+            models.Index(fields=['is_active', '-created_at'], name='product_active_created_idx'),
+            models.Index(fields=['usable_area_m2'], name='product_usable_area_idx'),
+        ]
+
     def __str__(self):
         return str(self.id) + " " + str(self.name) 
+
+
+class SearchToken(models.Model):
+    # Odwrócony indeks trigramów dla wyszukiwarki (extra/Search.py)
+    model_label = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    token = models.CharField(max_length=3)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_label', 'token', 'object_id'], name='searchtoken_lookup_idx'),
+            models.Index(fields=['model_label', 'object_id'], name='searchtoken_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}:{self.object_id} {self.token}"
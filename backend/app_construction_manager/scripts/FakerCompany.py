@@ -3,6 +3,40 @@ from app_construction_manager.models import Address, Company
 from faker import Faker
 import random
 
+STATES = [
+    'dolnośląskie', 'kujawsko-pomorskie', 'lubelskie', 'lubuskie',
+    'łódzkie', 'małopolskie', 'mazowieckie', 'opolskie',
+    'podkarpackie', 'podlaskie', 'pomorskie', 'śląskie',
+    'świętokrzyskie', 'warmińsko-mazurskie', 'wielkopolskie', 'zachodniopomorskie'
+]
+
+def build_address(fake, rng=random):
+    # Niezapisany obiekt - zapis (create / bulk_create) po stronie wywołującego
+    return Address(
+        street=fake.street_name(),
+        building_number=fake.building_number(),
+        apartment_number=fake.building_number() if rng.random() > 0.5 else None,
+        postal_code=fake.postcode(),
+        city=fake.city(),
+        state=rng.choice(STATES),
+        country='Polska',
+    )
+
+def build_company(fake, address, user, rng=random):
+    return Company(
+        name=fake.company(),
+        email=fake.company_email(),
+        address=address,
+        phone_number_1=fake.phone_number(),
+        phone_number_2=fake.phone_number(),
+        phone_number_3=fake.phone_number(),
+        vat_id=fake.msisdn()[:10],
+        regon_id=fake.msisdn()[:14],
+        is_active=rng.choice([True, False]),
+        timezone='Europe/Warsaw',
+        create_by=user,
+    )
+
 def run():
     fake = Faker('pl_PL')
     User = get_user_model()
@@ -16,38 +50,14 @@ def run():
     print("▶ Tworzę adresy...")
     addresses = []
     for _ in range(300):
-        addr = Address.objects.create(
-            street=fake.street_name(),
-            building_number=fake.building_number(),
-            apartment_number=fake.building_number() if random.random() > 0.5 else None,
-            postal_code=fake.postcode(),
-            city=fake.city(),
-            state=random.choice([
-                'dolnośląskie', 'kujawsko-pomorskie', 'lubelskie', 'lubuskie',
-                'łódzkie', 'małopolskie', 'mazowieckie', 'opolskie',
-                'podkarpackie', 'podlaskie', 'pomorskie', 'śląskie',
-                'świętokrzyskie', 'warmińsko-mazurskie', 'wielkopolskie', 'zachodniopomorskie'
-            ]),
-            country='Polska',
-        )
+        addr = build_address(fake)
+        addr.save()
         addresses.append(addr)
 
     print("▶ Tworzę firmy...")
     for i in range(1000):
-        Company.objects.create(
-            name=fake.company(),
-            email=fake.company_email(),
-            address=random.choice(addresses),
-            phone_number_1=fake.phone_number(),
-            phone_number_2=fake.phone_number(),
-            phone_number_3=fake.phone_number(),
-            vat_id=fake.msisdn()[:10],
-            regon_id=fake.msisdn()[:14],
-            is_active=random.choice([True, False]),
-            timezone='Europe/Warsaw',
-            create_by=user,
-        )
+        build_company(fake, random.choice(addresses), user).save()
         if i % 100 == 0:
             print(f" - {i} firm utworzonych...")
 
-    print("✅ Gotowe: 1000 firm i 300 adresów wygenerowanych.")
\ No newline at end of file
+    print("✅ Gotowe: 1000 firm i 300 adresów wygenerowanych.")
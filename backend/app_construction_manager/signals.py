@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from app_construction_manager.extra import Search
+from app_construction_manager.extra.Bulk import in_bulk_operation
+from app_construction_manager.extra.Cache import bump_version
+from app_construction_manager.models import Address, Company, Product
+
+User = get_user_model()
+
+# Pola wyszukiwarki globalnej DataTable (odpowiednik search_fields z controllers), nazwa waży najwięcej.
+# Pola liczbowe i logiczne nie trafiają do indeksu - obsługuje je Search.SearchParser.
+Search.register(Company, {
+    'name': 3, 'email': 1, 'phone_number_1': 1, 'vat_id': 1, 'regon_id': 1,
+    'address__state': 1, 'address__city': 1, 'address__postal_code': 1,
+}, numeric=['id'], boolean='is_active')
+Search.register(Product, {
+    'name': 3, 'description': 1,
+}, numeric=['id', 'price_net', 'price_gross', 'estimated_duration_weeks', 'usable_area_m2', 'net_area_m2',
+            'gross_volume_m3'], boolean='is_active')
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Address)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+def invalidate_model_cache(sender, **kwargs):
+    # Operacje masowe (extra/Bulk.py) unieważniają cache raz, po całej partii
+    if not in_bulk_operation():
+        bump_version(sender)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups_cache(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(User, Group)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Product)
+def update_search_index(sender, instance, **kwargs):
+    if not in_bulk_operation():
+        Search.get_search_backend().index([instance])
+
+
+@receiver(post_save, sender=Address)
+def update_company_search_index(sender, instance, **kwargs):
+    companies = Company.objects.filter(address=instance).select_related('address')
+    Search.get_search_backend().index(list(companies))
+
+
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Product)
+def remove_from_search_index(sender, instance, **kwargs):
+    if not in_bulk_operation():
+        Search.get_search_backend().remove(sender, [instance.pk])
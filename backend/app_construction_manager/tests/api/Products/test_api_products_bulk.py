@@ -0,0 +1,152 @@
+import pytest
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+
+from app_construction_manager.models import Company, Product, SearchToken
+
+TEST_ORDER = 44
+
+URL = "/api/construction/manager/products/bulk/"
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+def payload(company, user, name, **overrides):
+    return {
+        "name": name,
+        "description": "Projekt domu",
+        "price_net": 250000.0,
+        "price_gross": 307500.0,
+        "estimated_duration_weeks": 30,
+        "usable_area_m2": 120.0,
+        "net_area_m2": 110.0,
+        "gross_volume_m3": 360.0,
+        "is_active": True,
+        "company": company.pk,
+        "create_by": user.pk,
+        **overrides,
+    }
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_create_writes_batch_in_constant_queries(api_client, user, company, query_budget):
+    items = [payload(company, user, f"Katalog {i}") for i in range(50)]
+
+    # Zamiast zapytań na element: uwierzytelnienie, po jednym in_bulk na relację, jeden insert
+    # i paczki indeksu wyszukiwarki (~6000 tokenów)
+    with query_budget(20):
+        response = api_client.post(URL, items, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    assert len(response.data) == 50
+    assert all(row["id"] for row in response.data)
+    assert Product.objects.filter(name__startswith="Katalog").count() == 50
+
+    search = api_client.get("/api/construction/manager/products/", {"search": "katalog", "page": 1, "page_size": 100})
+    assert search.data["count"] == 50
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_create_returns_per_item_errors_and_writes_nothing(api_client, user, company):
+    items = [
+        payload(company, user, "Poprawny"),
+        payload(company, user, "", price_net="dużo"),
+        payload(company, user, "Też poprawny"),
+    ]
+
+    response = api_client.post(URL, items, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = response.data["errors"]
+    assert errors[0] == {} and errors[2] == {}
+    assert set(errors[1]) == {"name", "price_net"}
+    assert not Product.objects.filter(name__in=["Poprawny", "Też poprawny"]).exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_update_is_partial_and_touches_updated_at(api_client, user, company):
+    products = api_client.post(URL, [payload(company, user, f"Stary {i}") for i in range(3)], format="json").data
+    before = Product.objects.get(pk=products[0]["id"]).updated_at
+
+    response = api_client.patch(URL, [
+        {"id": products[0]["id"], "name": "Nowy 0"},
+        {"id": products[1]["id"], "usable_area_m2": 999.0},
+    ], format="json")
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    first, second, third = (Product.objects.get(pk=row["id"]) for row in products)
+    assert (first.name, first.usable_area_m2) == ("Nowy 0", 120.0)
+    assert (second.name, second.usable_area_m2) == ("Stary 1", 999.0)
+    assert third.name == "Stary 2"
+    assert first.updated_at > before
+    assert SearchToken.objects.filter(object_id=first.pk, token=" no").exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_update_reports_unknown_ids(api_client, user, company):
+    product = api_client.post(URL, [payload(company, user, "Jedyny")], format="json").data[0]
+
+    response = api_client.patch(URL, [{"id": product["id"], "name": "Zmieniony"}, {"id": 0, "name": "X"}], format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errors"][0] == {}
+    assert "id" in response.data["errors"][1]
+    assert Product.objects.get(pk=product["id"]).name == "Jedyny"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("bad_id", ["abc", [1], {"a": 1}, True])
+def test_bulk_update_rejects_malformed_ids_per_item(api_client, user, company, bad_id):
+    product = api_client.post(URL, [payload(company, user, "Jedyny")], format="json").data[0]
+
+    response = api_client.patch(URL, [{"id": product["id"], "name": "Zmieniony"}, {"id": bad_id, "name": "X"}], format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errors"][0] == {}
+    assert "id" in response.data["errors"][1]
+    assert Product.objects.get(pk=product["id"]).name == "Jedyny"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_update_accepts_string_numeric_ids(api_client, user, company):
+    product = api_client.post(URL, [payload(company, user, "Jedyny")], format="json").data[0]
+
+    response = api_client.patch(URL, [{"id": str(product["id"]), "name": "Zmieniony"}], format="json")
+
+    assert response.status_code == status.HTTP_200_OK, response.data
+    assert response.data[0]["name"] == "Zmieniony"
+    assert Product.objects.get(pk=product["id"]).name == "Zmieniony"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_destroy_deletes_batch_and_search_tokens(api_client, user, company):
+    products = api_client.post(URL, [payload(company, user, f"Usuwany {i}") for i in range(4)], format="json").data
+    ids = [row["id"] for row in products]
+
+    response = api_client.delete(URL, ids[:3] + [0], format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data["errors"] == [{}, {}, {}, {"id": [str(NotFound.default_detail)]}]
+    assert Product.objects.filter(pk__in=ids).count() == 4
+
+    response = api_client.delete(URL, ids[:3], format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"deleted": 3}
+    assert list(Product.objects.filter(pk__in=ids).values_list("pk", flat=True)) == ids[3:]
+    assert not SearchToken.objects.filter(model_label="app_construction_manager.product", object_id__in=ids[:3]).exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_bulk_payload_must_be_a_bounded_list(api_client):
+    assert api_client.post(URL, {"name": "nie lista"}, format="json").status_code == status.HTTP_400_BAD_REQUEST
+    assert api_client.delete(URL, list(range(1001)), format="json").status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 42
+
+URL = "/api/construction/manager/products/"
+
+
+def make_product(company, user, i):
+    return Product(
+        name=f"Dom Licznik {i}",
+        description="Projekt testowy",
+        price_net=1000.0,
+        price_gross=1230.0,
+        estimated_duration_weeks=20,
+        usable_area_m2=100.0 + i,
+        net_area_m2=90.0,
+        gross_volume_m3=300.0,
+        is_active=True,
+        company=company,
+        create_by=user,
+    )
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+@pytest.fixture
+def products(user, company):
+    return Product.objects.bulk_create([make_product(company, user, i) for i in range(5)])
+
+
+def count_queries(context):
+    return [query['sql'] for query in context.captured_queries if 'COUNT(' in query['sql'].upper()]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_exact_count_is_cached_for_equivalent_parameters(api_client, products):
+    first = api_client.get(URL, {'page': 1, 'page_size': 2, 'usable_area_m2_min': 101, 'name': 'Licznik'})
+    assert first.data['count'] == 4
+    assert first.data['has_next'] is True
+
+    with CaptureQueriesContext(connection) as context:
+        # Ta sama filtracja, inna kolejność parametrów i inna strona
+        second = api_client.get(URL, {'name': 'Licznik', 'usable_area_m2_min': 101, 'page': 2, 'page_size': 2})
+    assert second.data['count'] == 4
+    assert second.data['has_next'] is False
+    assert count_queries(context) == []
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cached_count_is_invalidated_by_writes(api_client, user, company, products):
+    assert api_client.get(URL, {'page': 1, 'page_size': 2}).data['count'] == 5
+
+    make_product(company, user, 99).save()
+    assert api_client.get(URL, {'page': 1, 'page_size': 2}).data['count'] == 6
+
+    Product.objects.get(name="Dom Licznik 99").delete()
+    assert api_client.get(URL, {'page': 1, 'page_size': 2}).data['count'] == 5
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_count_none_skips_count_query(api_client, products):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(URL, {'page': 2, 'page_size': 2, 'count': 'none'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['count'] is None
+    assert response.data['has_next'] is True
+    assert len(response.data['results']) == 2
+    assert 'page=3' in response.data['next']
+    assert 'page=' not in response.data['previous']
+    assert count_queries(context) == []
+
+    last = api_client.get(URL, {'page': 3, 'page_size': 2, 'count': 'none'})
+    assert last.data['has_next'] is False
+    assert last.data['next'] is None
+
+    assert api_client.get(URL, {'page': 4, 'page_size': 2, 'count': 'none'}).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_count_estimate_falls_back_to_exact_for_filtered_lists(api_client, products):
+    response = api_client.get(URL, {'page': 1, 'page_size': 2, 'count': 'estimate', 'usable_area_m2_max': 102})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['count'] == 3
+    assert response.data['has_next'] is True
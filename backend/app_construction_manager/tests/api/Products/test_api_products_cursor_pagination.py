@@ -0,0 +1,94 @@
+import pytest
+from rest_framework import status
+
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 41
+
+URL = "/api/construction/manager/products/"
+
+
+@pytest.fixture
+def products(user, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    # bulk_create daje prawie identyczne created_at - kursor musi rozstrzygać remisy po id
+    return Product.objects.bulk_create([
+        Product(
+            name=f"Dom Kursor {i}",
+            description="Projekt testowy",
+            price_net=1000.0,
+            price_gross=1230.0,
+            estimated_duration_weeks=20,
+            usable_area_m2=50.0 + i * 10,
+            net_area_m2=90.0,
+            gross_volume_m3=300.0,
+            is_active=True,
+            company=company,
+            create_by=user,
+        )
+        for i in range(7)
+    ])
+
+
+def walk(api_client, url, params):
+    ids, pages = [], []
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        pages.append(response.data)
+        ids += [row['id'] for row in response.data['results']]
+        if not response.data['next']:
+            return ids, pages
+        response = api_client.get(response.data['next'])
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cursor_walks_every_row_once_in_default_order(api_client, products):
+    ids, pages = walk(api_client, URL, {'cursor': '', 'page_size': 3})
+
+    expected = list(Product.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+    assert ids == expected
+    assert [len(page['results']) for page in pages] == [3, 3, 1]
+    assert pages[0]['previous'] is None
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cursor_previous_link_returns_the_prior_page(api_client, products):
+    first = api_client.get(URL, {'cursor': '', 'page_size': 3}).data
+    second = api_client.get(first['next']).data
+    back = api_client.get(second['previous']).data
+
+    assert [row['id'] for row in back['results']] == [row['id'] for row in first['results']]
+    assert back['previous'] is None
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cursor_combines_with_filter_and_reversed_ordering(api_client, products):
+    ids, _ = walk(api_client, URL, {'cursor': '', 'page_size': 2, 'usable_area_m2_min': 80, 'ordering': 'created_at'})
+
+    expected = list(
+        Product.objects.filter(usable_area_m2__gte=80).order_by('created_at', 'id').values_list('id', flat=True)
+    )
+    assert ids == expected
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(api_client):
+    response = api_client.get(URL, {'cursor': 'not-a-cursor'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cursor_rejects_unsupported_ordering(api_client, products):
+    response = api_client.get(URL, {'cursor': '', 'ordering': 'name'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'ordering' in response.data
+
+    response = api_client.get(URL, {'cursor': '', 'ordering': '-created_at'})
+    assert response.status_code == status.HTTP_200_OK
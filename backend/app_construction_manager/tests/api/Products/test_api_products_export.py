@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+import pytest
+from rest_framework import status
+
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 40
+
+
+@pytest.fixture
+def products(user, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    return Product.objects.bulk_create([
+        Product(
+            name=f"Dom Export {i}",
+            description="Projekt testowy",
+            price_net=1000.0 * i,
+            price_gross=1230.0 * i,
+            estimated_duration_weeks=20,
+            usable_area_m2=100.0 + i,
+            net_area_m2=90.0,
+            gross_volume_m3=300.0,
+            is_active=i % 2 == 0,
+            company=company,
+            create_by=user,
+        )
+        for i in range(1, 6)
+    ])
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_export_products_csv_uses_filters_and_columns(api_client, products):
+    response = api_client.get(
+        "/api/construction/manager/products/export/",
+        {'columns': 'name,usable_area_m2', 'usable_area_m2_min': 103, 'ordering': 'usable_area_m2'},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/csv')
+    assert 'attachment' in response['Content-Disposition']
+
+    rows = list(csv.reader(io.StringIO(read_stream(response).lstrip('\ufeff'))))
+    assert rows[0] == ['name', 'usable_area_m2']
+    assert [row[0] for row in rows[1:]] == ['Dom Export 3', 'Dom Export 4', 'Dom Export 5']
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_export_products_ndjson(api_client, products):
+    response = api_client.get(
+        "/api/construction/manager/products/export/",
+        {'export_format': 'ndjson', 'columns': 'id,name,is_active', 'search': 'Dom Export'},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    lines = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert len(lines) == len(products)
+    assert set(lines[0]) == {'id', 'name', 'is_active'}
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_export_company_flattens_nested_address(api_client, company_payload):
+    Company.objects.create(**company_payload(as_instance=True))
+    response = api_client.get(
+        "/api/construction/manager/company/export/",
+        {'export_format': 'ndjson', 'columns': 'name,address.city'},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    first = json.loads(read_stream(response).splitlines()[0])
+    assert first == {'name': 'Test Company', 'address.city': 'Test City'}
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_export_rejects_unknown_column_and_format(api_client):
+    response = api_client.get("/api/construction/manager/products/export/", {'columns': 'name,secret'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'columns' in response.data
+
+    response = api_client.get("/api/construction/manager/products/export/", {'export_format': 'xml'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 43
+
+URL = "/api/construction/manager/products/"
+
+
+@pytest.fixture
+def products(user, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    rows = [
+        ("Magnolia", 80.0, 250000.0, 307500.5, True),
+        ("Magnolia Premium", 140.0, 490000.0, 602700.0, True),
+        ("Dom Marzenie 5", 210.0, 735000.0, 904050.0, False),
+    ]
+    return [
+        Product.objects.create(
+            name=name,
+            description="Projekt domu",
+            price_net=net,
+            price_gross=gross,
+            estimated_duration_weeks=30,
+            usable_area_m2=area,
+            net_area_m2=area - 5,
+            gross_volume_m3=area * 3,
+            is_active=active,
+            company=company,
+            create_by=user,
+        )
+        for name, area, net, gross, active in rows
+    ]
+
+
+def search(api_client, value):
+    response = api_client.get(URL, {'search': value, 'ordering': 'usable_area_m2', 'page': 1, 'page_size': 10})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return [row['name'] for row in response.data['results']]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize('value, expected', [
+    ('140', ["Magnolia Premium"]),
+    ('100-220', ["Magnolia Premium", "Dom Marzenie 5"]),
+    ('100..220', ["Magnolia Premium", "Dom Marzenie 5"]),
+    ('>=490000', ["Magnolia Premium", "Dom Marzenie 5"]),
+    ('>1000000', []),
+    ('usable_area_m2<100', ["Magnolia"]),
+    ('usable_area_m2:100-150', ["Magnolia Premium"]),
+    ('estimated_duration_weeks=30', ["Magnolia", "Magnolia Premium", "Dom Marzenie 5"]),
+    ('307500,5', ["Magnolia"]),
+    ('nie', ["Dom Marzenie 5"]),
+    ('true', ["Magnolia", "Magnolia Premium"]),
+    ('magnolia usable_area_m2>100', ["Magnolia Premium"]),
+    ('marzenie 5', ["Dom Marzenie 5"]),
+    ('12345', []),
+])
+def test_search_terms_are_classified_by_type(api_client, products, value, expected):
+    assert search(api_client, value) == expected
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_numeric_search_compares_columns_instead_of_casting(api_client, products):
+    with CaptureQueriesContext(connection) as context:
+        search(api_client, '100-220')
+
+    sql = ' '.join(query['sql'] for query in context.captured_queries).upper()
+    assert 'CAST(' not in sql
+    assert 'LIKE' not in sql
+    assert '"USABLE_AREA_M2" BETWEEN' in sql
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_dash_term_on_company_matches_postal_code(api_client, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    company.address.postal_code = "90-950"
+    company.address.save()
+
+    response = api_client.get("/api/construction/manager/company/", {'search': '90-950', 'page': 1, 'page_size': 10})
+    assert [row['id'] for row in response.data['results']] == [company.pk]
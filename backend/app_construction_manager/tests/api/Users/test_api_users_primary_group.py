@@ -0,0 +1,106 @@
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+TEST_ORDER = 34
+
+URL = "/api/construction/manager/user/"
+
+
+def primary_group(user):
+    user.refresh_from_db(fields=["primary_group_name"])
+    return user.primary_group_name
+
+
+@pytest.fixture
+def groups():
+    return {name: Group.objects.get_or_create(name=name)[0] for name in ("Admin", "Kierownik", "Pracownik")}
+
+
+@pytest.fixture
+def member(user_with_company):
+    return User.objects.create(
+        email="czlonek@example.com", username="czlonek@example.com", user_company=user_with_company.user_company,
+    )
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_primary_group_follows_membership_changes(member, groups):
+    assert primary_group(member) is None
+
+    member.groups.add(groups["Pracownik"], groups["Kierownik"])
+    assert primary_group(member) == "Kierownik"
+
+    groups["Admin"].user_set.add(member)
+    assert primary_group(member) == "Admin"
+
+    member.groups.remove(groups["Admin"])
+    assert primary_group(member) == "Kierownik"
+
+    groups["Kierownik"].user_set.clear()
+    assert primary_group(member) == "Pracownik"
+
+    member.groups.clear()
+    assert primary_group(member) is None
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_primary_group_follows_group_rename_and_delete(member, groups):
+    member.groups.add(groups["Kierownik"], groups["Pracownik"])
+
+    groups["Pracownik"].name = "Biuro"
+    groups["Pracownik"].save()
+    assert primary_group(member) == "Biuro"
+
+    groups["Pracownik"].delete()
+    assert primary_group(member) == "Kierownik"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_sorting_by_groups_needs_no_group_by(api_client, user_with_company, groups):
+    for name, group in [("c", "Pracownik"), ("a", "Admin"), ("b", "Kierownik")]:
+        user = User.objects.create(
+            email=f"{name}@example.com", username=f"{name}@example.com", user_company=user_with_company.user_company,
+        )
+        user.groups.add(groups[group])
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(URL, {"ordering": "groups"})
+    emails = [item["email"] for item in response.data if item["primary_group_name"]]
+    assert emails == ["a@example.com", "b@example.com", "c@example.com"]
+    assert not any("GROUP BY" in query["sql"] for query in context.captured_queries)
+
+    response = api_client.get(URL, {"ordering": "-groups"})
+    assert [item["email"] for item in response.data if item["primary_group_name"]] == emails[::-1]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_backfill_command_restores_primary_group(member, groups):
+    member.groups.add(groups["Kierownik"])
+    User.objects.update(primary_group_name=None)
+
+    call_command("backfill_primary_group_name", chunk_size=1, stdout=StringIO())
+    assert primary_group(member) == "Kierownik"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_migration_fills_primary_group(member, groups):
+    member.groups.add(groups["Pracownik"], groups["Admin"])
+    User.objects.update(primary_group_name=None)
+
+    migration = import_module("global_auth.migrations.0004_customuser_primary_group_name")
+    migration.fill_primary_group_name(apps, None)
+    assert primary_group(member) == "Admin"
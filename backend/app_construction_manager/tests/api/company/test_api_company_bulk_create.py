@@ -0,0 +1,68 @@
+import pytest
+from rest_framework import status
+
+from app_construction_manager.models import Address, Company
+
+TEST_ORDER = 22
+
+URL = "/api/construction/manager/company/"
+
+
+def companies(company_payload, count):
+    items = []
+    for i in range(count):
+        item = company_payload()
+        item["name"] = f"Import {i}"
+        item["address"] = {**item["address"], "city": f"Miasto {i}"}
+        items.append(item)
+    return items
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_payload_creates_companies_with_their_addresses(api_client, user, company_payload, query_budget):
+    items = companies(company_payload, 30)
+
+    # Uwierzytelnienie, jeden INSERT adresów, jeden INSERT firm i paczki indeksu wyszukiwarki
+    # zamiast dwóch zapytań na firmę
+    with query_budget(20):
+        response = api_client.post(URL, items, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    assert [row["name"] for row in response.data] == [f"Import {i}" for i in range(30)]
+
+    created = Company.objects.filter(name__startswith="Import ").select_related("address").order_by("pk")
+    assert [(company.name, company.address.city) for company in created] == [
+        (f"Import {i}", f"Miasto {i}") for i in range(30)
+    ]
+    assert all(company.create_by_id == user.pk for company in created)
+
+    search = api_client.get(URL, {"search": "miasto", "page": 1, "page_size": 50})
+    assert search.data["count"] == 30
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_payload_with_invalid_company_writes_nothing(api_client, company_payload):
+    items = companies(company_payload, 3)
+    items[1]["email"] = "niepoprawny-email"
+    del items[2]["address"]["city"]
+    addresses_before = Address.objects.count()
+
+    response = api_client.post(URL, items, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = response.data["errors"]
+    assert errors[0] == {}
+    assert "email" in errors[1]
+    assert "city" in errors[2]["address"]
+    assert not Company.objects.filter(name__startswith="Import ").exists()
+    assert Address.objects.count() == addresses_before
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_single_company_payload_still_uses_nested_create(api_client, company_payload):
+    response = api_client.post(URL, company_payload(), format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["address"]["city"] == company_payload()["address"]["city"]
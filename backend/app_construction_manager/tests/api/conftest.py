@@ -25,6 +25,39 @@ env = environ.Env(
 environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Cache (wersje modeli, liczniki) nie jest wycofywany razem z transakcją testu.
+    """
+    from django.core.cache import cache
+    from app_construction_manager.extra.ResponseCache import get_list_cache
+    from global_auth.authentication import get_token_cache, get_user_cache
+    cache.clear()
+    get_list_cache().clear()
+    get_user_cache().clear()
+    get_token_cache().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def single_worker(settings):
+    """
+    Testy działają w jednym procesie - cache w pamięci procesu może trzymać wersje modeli.
+    """
+    settings.WEB_CONCURRENCY = 1
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Context manager asserting the maximum number of SQL queries in a block:
+    with query_budget(3): api_client.get(url)
+    """
+    from app_construction_manager.extra.Queries import assert_max_queries
+    return assert_max_queries
+
+
 @pytest.fixture
 def unauthenticated_client():
     """
@@ -0,0 +1,102 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt import tokens as tokens_module
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from global_auth.authentication import CachedJWTAuthentication, get_token_cache, get_user_cache
+from global_project import cache as shared_cache
+
+User = get_user_model()
+TEST_ORDER = 58
+
+ME_URL = "/api/v1/auth/users/me/"
+
+
+def authenticate(user):
+    request = RequestFactory().get(ME_URL, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return CachedJWTAuthentication().authenticate(request)[0]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_authenticated_user_is_cached_with_company_and_groups(user_with_company, query_budget):
+    group, _ = Group.objects.get_or_create(name="Kierownik")
+    user_with_company.groups.add(group)
+    authenticate(user_with_company)
+
+    with query_budget(0):
+        cached = authenticate(user_with_company)
+        assert cached.user_company == user_with_company.user_company
+        assert [group.name for group in cached.groups.all()] == ["Kierownik"]
+
+    # Każdy request dostaje własną kopię - razem z firmą i listą grup
+    other = authenticate(user_with_company)
+    assert cached is not other
+    cached.user_company.name = "Zmieniona w jednym requeście"
+    cached.groups.all()[0].name = "Zmieniona"
+    assert other.user_company.name == user_with_company.user_company.name
+    assert [group.name for group in other.groups.all()] == ["Kierownik"]
+    assert cached.groups.all() is not other.groups.all()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cached_user_is_invalidated_by_changes(user_with_company):
+    authenticate(user_with_company)
+
+    group, _ = Group.objects.get_or_create(name="Pracownik")
+    user_with_company.groups.add(group)
+    assert [group.name for group in authenticate(user_with_company).groups.all()] == ["Pracownik"]
+
+    user_with_company.first_name = "Zmienione"
+    user_with_company.save()
+    assert authenticate(user_with_company).first_name == "Zmienione"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_deactivated_user_is_rejected():
+    user = User.objects.create_user(email="nieaktywny@example.com", username="nieaktywny@example.com", password="x")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    assert client.get(ME_URL).status_code == status.HTTP_200_OK
+
+    user.is_active = False
+    user.save()
+    assert client.get(ME_URL).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_validated_tokens_are_cached_until_expiry(user, monkeypatch):
+    token = AccessToken.for_user(user)
+    token.set_exp(lifetime=timedelta(seconds=30))
+    request = RequestFactory().get(ME_URL, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    CachedJWTAuthentication().authenticate(request)
+    CachedJWTAuthentication().authenticate(request)
+    stats = get_token_cache().stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    # Po czasie życia tokenu wpis wygasa, a ponowna weryfikacja odrzuca token
+    now = time.monotonic()
+    monkeypatch.setattr(shared_cache.time, "monotonic", lambda: now + 60)
+    monkeypatch.setattr(tokens_module, "aware_utcnow", lambda: datetime.now(timezone.utc) + timedelta(seconds=60))
+    with pytest.raises(InvalidToken):
+        CachedJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_user_cache_ttl_is_short_without_shared_versions(settings):
+    assert get_user_cache().timeout == 60
+    settings.WEB_CONCURRENCY = 4
+    assert get_user_cache().timeout == 5
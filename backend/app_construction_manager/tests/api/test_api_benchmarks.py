@@ -0,0 +1,59 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_construction_manager.benchmarks.dataset import seed_dataset
+from app_construction_manager.benchmarks.runner import compare, run_scenario
+from app_construction_manager.benchmarks.scenarios import build_scenarios
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 54
+
+
+def result(p95, queries=2, memory=100.0):
+    return {'p50_ms': p95 / 2, 'p95_ms': p95, 'queries': queries, 'peak_memory_kb': memory}
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_compare_reports_regressions_above_threshold():
+    baseline = {'scenarios': {'list': result(10.0), 'search': result(100.0), 'gone': result(1.0)}}
+    current = {'scenarios': {'list': result(10.5, queries=3), 'search': result(150.0), 'new': result(1.0)}}
+
+    regressions = compare(baseline, current, threshold=0.2)
+
+    assert {(item['scenario'], item['metric']) for item in regressions} == {
+        ('list', 'queries'), ('search', 'p50_ms'), ('search', 'p95_ms'),
+    }
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_seeded_dataset_covers_every_scenario_kind():
+    companies_before, products_before = Company.objects.count(), Product.objects.count()
+    user = seed_dataset(companies=3, products_per_company=4, users=2, seed=1, workers=1, log=lambda message: None)
+    assert Company.objects.count() - companies_before == 3
+    assert Product.objects.count() - products_before == 12
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    scenarios = {item['name']: item for item in build_scenarios(client)}
+
+    for name in ('products:list', 'products:deep_page', 'products:filter:usable_area_m2_min', 'products:search',
+                 'products:ordering:-price_net', 'products:export', 'company:filter:address__city',
+                 'user:filter:groups', 'auth:me', 'auth:me:uncached', 'products:large_page',
+                 'products:large_page:drf'):
+        assert name in scenarios
+
+    measured = run_scenario(client, scenarios['products:search'], repeat=2)
+    assert measured['status'] == 200
+    # Ciepły request: strona z cache list, użytkownik z cache uwierzytelnienia, walidatory bez zapytań
+    assert measured['queries'] == 0
+    assert measured['p95_ms'] >= measured['p50_ms'] > 0
+
+    for name in ('user:large_page', 'user:large_page:drf'):
+        measured = run_scenario(client, scenarios[name], repeat=1)
+        assert measured['status'] == 200
+
+    # Para auth:me - z cache użytkownik nie jest czytany z bazy, bez cache przy każdym requeście
+    assert run_scenario(client, scenarios['auth:me'], repeat=1)['queries'] == 0
+    assert run_scenario(client, scenarios['auth:me:uncached'], repeat=1)['queries'] >= 1
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from app_construction_manager.extra.Renderers import columnar
+from app_construction_manager.models import Address, Company
+
+TEST_ORDER = 63
+
+COMPANY_URL = "/api/construction/manager/company/"
+USER_URL = "/api/construction/manager/user/"
+PAGE = {"page": 1, "page_size": 10}
+
+
+@pytest.fixture
+def companies(user):
+    for i in range(4):
+        address = None if i == 0 else Address.objects.create(
+            street=f"Ulica {i}", building_number=str(i), postal_code="00-001",
+            city="Gdańsk", state="pomorskie", country="Polska",
+        )
+        Company.objects.create(
+            name=f"Firma kolumnowa {i}", email=f"kolumny{i}@example.com", address=address, phone_number_1="1",
+            phone_number_2="2", phone_number_3="3", vat_id="1234567890", regon_id="123456789",
+            is_active=True, timezone="Europe/Warsaw", create_by=user,
+        )
+
+
+def decode(data):
+    # To samo co decodeColumnar we froncie: kolumny "a.b" wracają do zagnieżdżonych obiektów
+    results = []
+    for values in data["rows"]:
+        row = {}
+        for column, value in zip(data["columns"], values):
+            *parents, key = column.split(".")
+            target = row
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[key] = value
+        results.append(row)
+    return results
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_columnar_flattens_nested_objects():
+    data = {"count": 2, "next": None, "results": [
+        {"id": 1, "address": None, "groups": ["Admin"]},
+        {"id": 2, "address": {"city": "Gdańsk", "street": "Długa"}, "groups": []},
+    ]}
+    assert columnar(data) == {
+        "columns": ["id", "address.city", "address.street", "groups"],
+        "rows": [[1, None, None, ["Admin"]], [2, "Gdańsk", "Długa", []]],
+        "count": 2,
+        "next": None,
+    }
+    assert columnar({"id": 1}) == {"id": 1}
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_company_page_in_columnar_format(api_client, companies):
+    regular = api_client.get(COMPANY_URL, PAGE)
+    response = api_client.get(COMPANY_URL, {**PAGE, "format": "columnar"})
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+
+    data = json.loads(response.content)
+    assert data["count"] == regular.data["count"]
+    assert "address.city" in data["columns"]
+    assert len(data["rows"]) == len(regular.data["results"])
+    assert len(response.content) < len(regular.content)
+
+    # Firma bez adresu wraca z pustymi kolumnami adresu
+    for decoded, expected in zip(decode(data), json.loads(regular.content)["results"]):
+        if expected["address"] is None:
+            assert set(decoded["address"].values()) == {None}
+            decoded["address"] = None
+        assert decoded == expected
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_columnar_unpaginated_list_and_detail(api_client, user_with_company, companies):
+    data = json.loads(api_client.get(USER_URL, {"format": "columnar"}).content)
+    assert data["count"] == len(data["rows"]) >= 1
+    assert "groups" in data["columns"]
+
+    company = Company.objects.filter(name__startswith="Firma kolumnowa").first()
+    detail = api_client.get(f"{COMPANY_URL}{company.pk}/", {"format": "columnar"})
+    assert json.loads(detail.content)["id"] == company.pk
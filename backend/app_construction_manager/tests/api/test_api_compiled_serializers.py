@@ -0,0 +1,94 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import override_settings
+
+from app_construction_manager.controllers import Company as company_controller
+from app_construction_manager.controllers import Products as products_controller
+from app_construction_manager.controllers import User as user_controller
+from app_construction_manager.extra.Compiled import class_compiled_serializer
+from app_construction_manager.extra.ResponseCache import get_list_cache
+from app_construction_manager.models import Address, Company, Product
+
+User = get_user_model()
+TEST_ORDER = 61
+
+COMPANY_URL = "/api/construction/manager/company/"
+PRODUCTS_URL = "/api/construction/manager/products/"
+USER_URL = "/api/construction/manager/user/"
+PAGE = {"page": 1, "page_size": 50}
+
+REQUESTS = [
+    (COMPANY_URL, PAGE),
+    (COMPANY_URL, {**PAGE, "fields": "id,name,address.city", "expand": "create_by"}),
+    (COMPANY_URL, {"cursor": "", "page_size": 2}),
+    (PRODUCTS_URL, PAGE),
+    (PRODUCTS_URL, {**PAGE, "count": "none", "ordering": "-price_net"}),
+    (PRODUCTS_URL, {**PAGE, "expand": "company,create_by"}),
+    (USER_URL, {"ordering": "groups"}),
+    (USER_URL, {"fields": "id,groups", "expand": "user_company"}),
+    (f"{PRODUCTS_URL}export/", {"export_format": "ndjson"}),
+    (f"{USER_URL}export/", {"export_format": "csv"}),
+]
+
+
+@pytest.fixture
+def dataset(user_with_company):
+    groups = [Group.objects.get_or_create(name=name)[0] for name in ("Admin", "Kierownik")]
+    for i in range(3):
+        address = None if i == 0 else Address.objects.create(
+            street=f"Ulica {i}", building_number=str(i), postal_code="00-001",
+            city="Kraków", state="małopolskie", country="Polska",
+        )
+        company = Company.objects.create(
+            name=f"Firma „{i}”", email=f"firma{i}@example.com", address=address, phone_number_1="1",
+            phone_number_2="2", phone_number_3="3", vat_id="1234567890", regon_id="123456789",
+            is_active=bool(i % 2), timezone="Europe/Warsaw", create_by=user_with_company,
+        )
+        Product.objects.create(
+            name=f"Dom {i}", description="Projekt\nz opisem", price_net=1000.5 + i, price_gross=1230.0,
+            estimated_duration_weeks=10 + i, usable_area_m2=100.0, net_area_m2=90.25, gross_volume_m3=300.0,
+            is_active=True, company=company, create_by=user_with_company,
+        )
+        member = User.objects.create(
+            email=f"kompilowany{i}@example.com", username=f"kompilowany{i}", user_company=user_with_company.user_company,
+        )
+        member.groups.set(groups[:i])
+
+
+def fetch(client, url, params):
+    get_list_cache().clear()
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return b"".join(response.streaming_content) if response.streaming else response.content
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.parametrize(
+    "controller", [company_controller, products_controller, user_controller], ids=["company", "products", "user"]
+)
+def test_viewset_serializers_compile(controller):
+    assert class_compiled_serializer(controller.Serializer) is not None
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, params", REQUESTS, ids=[f"{url} {sorted(params)}" for url, params in REQUESTS])
+def test_compiled_output_is_byte_identical(api_client, dataset, url, params):
+    with override_settings(COMPILED_SERIALIZERS=True):
+        compiled = fetch(api_client, url, params)
+    with override_settings(COMPILED_SERIALIZERS=False):
+        expected = fetch(api_client, url, params)
+    assert compiled == expected
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_compiled_list_keeps_query_count(api_client, dataset, query_budget):
+    api_client.get("/api/v1/auth/users/me/")
+    # Użytkownik z cache uwierzytelnienia: strona + grupy jednym zapytaniem (lista użytkowników nie jest stronicowana)
+    with query_budget(2):
+        response = api_client.get(USER_URL)
+    assert [item["groups"] for item in response.data if item["email"].startswith("kompilowany")] == [
+        [], ["Admin"], ["Admin", "Kierownik"],
+    ][::-1]
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+
+from app_construction_manager.models import Company
+
+TEST_ORDER = 57
+
+COMPANY_URL = "/api/construction/manager/company/"
+PAGE = {"page": 1, "page_size": 10}
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_answers_matching_etag_with_304(api_client, company, query_budget):
+    first = api_client.get(COMPANY_URL, PAGE)
+    etag = first["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" in first
+    assert "no-cache" in first["Cache-Control"]
+
+    # Walidatory pochodzą z cache (wersje modeli) - zostaje tylko zapytanie uwierzytelnienia
+    with query_budget(1):
+        response = api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert not response.content
+
+    assert api_client.get(COMPANY_URL, {**PAGE, "page_size": 5}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_etag_changes_after_update_and_delete(api_client, company):
+    etag = api_client.get(COMPANY_URL, PAGE)["ETag"]
+
+    company.name = "Nowa nazwa"
+    company.save()
+    response = api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+    etag = response["ETag"]
+    assert api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+    company.delete()
+    assert api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_detail_conditional_get(api_client, company):
+    url = f"{COMPANY_URL}{company.pk}/"
+    first = api_client.get(url)
+    assert first.status_code == status.HTTP_200_OK
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == status.HTTP_304_NOT_MODIFIED
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    api_client.patch(url, {"name": "Po zmianie"}, format="json")
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_last_modified_follows_writes(api_client, company):
+    first = api_client.get(COMPANY_URL, PAGE)
+    response = api_client.get(COMPANY_URL, PAGE, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    cache.set("cm:modified:app_construction_manager.company", time.time() + 60, None)
+    response = api_client.get(COMPANY_URL, PAGE, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_etag_from_content_without_shared_versions(api_client, company, settings):
+    settings.WEB_CONCURRENCY = 4
+    first = api_client.get(COMPANY_URL, PAGE)
+    assert first["X-Cache"] == "BYPASS"
+    assert "Last-Modified" not in first
+
+    assert api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    Company.objects.filter(pk=company.pk).update(name="Zmiana poza sygnałami")
+    assert api_client.get(COMPANY_URL, PAGE, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
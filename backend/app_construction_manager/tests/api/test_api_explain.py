@@ -0,0 +1,63 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_construction_manager.models import Company
+
+User = get_user_model()
+TEST_ORDER = 59
+
+COMPANY_URL = "/api/construction/manager/company/"
+
+
+@pytest.fixture
+def staff_client():
+    staff = User.objects.create_user(email="staff@example.com", username="staff@example.com", password="x",
+                                     is_staff=True)
+    client = APIClient()
+    client.force_authenticate(staff)
+    return client
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_explain_returns_sql_and_plans_instead_of_rows(staff_client, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    params = {"page": 1, "page_size": 10, "name": company.name[:6], "ordering": "-name", "_explain": 1}
+    # Drugie wywołanie: liczba rekordów już w cache - i tak pokazujemy jej plan
+    for cached in (False, True):
+        response = staff_client.get(COMPANY_URL, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert "results" not in response.data
+
+        queries = {query["kind"]: query for query in response.data["queries"]}
+        assert set(queries) == {"count", "page"}
+        assert queries["count"]["cached"] is cached
+        assert "LIKE" in queries["page"]["sql"] and "ORDER BY" in queries["page"]["sql"]
+        assert f"%{company.name[:6]}%" in queries["page"]["params"]
+        assert queries["page"]["plan"]
+        assert queries["page"]["time_ms"] >= 0
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_explain_is_ignored_for_non_staff(api_client):
+    response = api_client.get(COMPANY_URL, {"page": 1, "page_size": 10, "_explain": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert "results" in response.data
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_explain_labels_search_page_query_as_page(staff_client, company_payload):
+    company = Company.objects.create(**company_payload(as_instance=True))
+    params = {"page": 1, "page_size": 10, "search": company.name, "_explain": 1}
+    response = staff_client.get(COMPANY_URL, params)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Zapytanie strony też zawiera COUNT( (HAVING w podzapytaniu indeksu) - liczy się faza paginatora
+    kinds = [query["kind"] for query in response.data["queries"]]
+    assert kinds.count("count") == 1 and kinds.count("page") == 1
+    page = next(query for query in response.data["queries"] if query["kind"] == "page")
+    assert "COUNT(" in page["sql"].upper() and "LIMIT" in page["sql"].upper()
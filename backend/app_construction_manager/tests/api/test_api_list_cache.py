@@ -0,0 +1,107 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_construction_manager.extra.Cache import versioned_cache_enabled
+from app_construction_manager.extra.ResponseCache import LocalLRUBackend, get_list_cache
+from app_construction_manager.models import Company
+
+User = get_user_model()
+TEST_ORDER = 56
+
+COMPANY_URL = "/api/construction/manager/company/"
+USERS_URL = "/api/construction/manager/user/"
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_repeated_list_is_served_from_cache(api_client, company, query_budget):
+    first = api_client.get(COMPANY_URL, {"page": 1, "page_size": 10})
+    assert first["X-Cache"] == "MISS"
+
+    # Kolejność parametrów nie zmienia klucza; zostaje tylko zapytanie uwierzytelnienia
+    with query_budget(1):
+        second = api_client.get(f"{COMPANY_URL}?page_size=10&page=1")
+    assert second.status_code == status.HTTP_200_OK
+    assert second["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+
+    other = api_client.get(COMPANY_URL, {"page": 1, "page_size": 5})
+    assert other["X-Cache"] == "MISS"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_write_invalidates_cached_list(api_client, company):
+    api_client.get(COMPANY_URL, {"page": 1, "page_size": 10})
+
+    company.name = "Zmieniona nazwa"
+    company.save()
+
+    response = api_client.get(COMPANY_URL, {"page": 1, "page_size": 10})
+    assert response["X-Cache"] == "MISS"
+    assert "Zmieniona nazwa" in [item["name"] for item in response.json()["results"]]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_cache_is_separate_per_user_company(user_with_company, company_payload):
+    other_company = Company.objects.create(**{**company_payload(as_instance=True), "name": "Inna firma"})
+    other = User.objects.create_user(
+        email="other@example.com", username="other@example.com", password="x", user_company=other_company
+    )
+
+    client = APIClient()
+    client.force_authenticate(user_with_company)
+    assert client.get(USERS_URL)["X-Cache"] == "MISS"
+    assert client.get(USERS_URL)["X-Cache"] == "HIT"
+
+    client.force_authenticate(other)
+    response = client.get(USERS_URL)
+    assert response["X-Cache"] == "MISS"
+    assert [item["email"] for item in response.json()] == ["other@example.com"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@override_settings(LIST_RESPONSE_CACHE={"BACKEND": "shared"})
+def test_shared_backend_and_counters(api_client, company):
+    api_client.get(COMPANY_URL)
+    api_client.get(COMPANY_URL)
+
+    stats = get_list_cache().stats()
+    assert stats["backend"] == "shared"
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_local_backend_evicts_least_recently_used():
+    backend = LocalLRUBackend(max_entries=2, timeout=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_process_local_cache_is_bypassed_with_many_workers(api_client, company, settings):
+    settings.WEB_CONCURRENCY = 4
+    assert not versioned_cache_enabled()
+    assert api_client.get(COMPANY_URL, {"page": 1, "page_size": 10})["X-Cache"] == "BYPASS"
+    assert api_client.get(COMPANY_URL, {"page": 1, "page_size": 10})["X-Cache"] == "BYPASS"
+
+    settings.WEB_CONCURRENCY = None
+    assert not versioned_cache_enabled()
+    with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                                               "LOCATION": "/tmp/cm-test-cache"}}):
+        assert versioned_cache_enabled()
@@ -0,0 +1,118 @@
+import logging
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from app_construction_manager.controllers import Company as company_controller, User as user_controller
+from app_construction_manager.extra.Fields import class_relation_plan
+from app_construction_manager.extra.Queries import NPlusOneDetectionMiddleware
+from app_construction_manager.models import Address, Company, Product
+
+User = get_user_model()
+TEST_ORDER = 52
+
+ROWS = 10
+
+# Stała liczba zapytań niezależnie od liczby wierszy na stronie, użytkownik z cache uwierzytelnienia:
+# COUNT + strona; dla użytkowników dodatkowo prefetch grup
+LIST_BUDGETS = {
+    "/api/construction/manager/company/": 2,
+    "/api/construction/manager/products/": 2,
+    "/api/construction/manager/user/": 3,
+}
+# Rozwinięte relacje są dołączane JOIN-em do zapytania strony, więc budżet się nie zmienia
+EXPANDED_BUDGETS = {
+    "/api/construction/manager/company/": ("create_by", 2),
+    "/api/construction/manager/products/": ("company,create_by", 2),
+    "/api/construction/manager/user/": ("user_company", 3),
+}
+ME_URL = "/api/v1/auth/users/me/"
+
+
+@pytest.fixture
+def dataset(user_with_company):
+    groups = [Group.objects.get_or_create(name=name)[0] for name in ("Admin", "Kierownik")]
+    for i in range(ROWS):
+        address = Address.objects.create(
+            street=f"Ulica {i}", building_number=str(i), postal_code="00-001",
+            city="Warszawa", state="mazowieckie", country="Polska",
+        )
+        company = Company.objects.create(
+            name=f"Firma {i}", email=f"firma{i}@example.com", address=address, phone_number_1="1",
+            phone_number_2="2", phone_number_3="3", vat_id="1234567890", regon_id="123456789",
+            is_active=True, timezone="Europe/Warsaw", create_by=user_with_company,
+        )
+        Product.objects.create(
+            name=f"Dom {i}", description="Projekt", price_net=1.0, price_gross=1.23, estimated_duration_weeks=10,
+            usable_area_m2=100.0, net_area_m2=90.0, gross_volume_m3=300.0, is_active=True,
+            company=company, create_by=user_with_company,
+        )
+        member = User.objects.create(
+            email=f"pracownik{i}@example.com", username=f"pracownik{i}", user_company=user_with_company.user_company,
+        )
+        member.groups.set(groups)
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, budget", LIST_BUDGETS.items(), ids=list(LIST_BUDGETS))
+def test_list_endpoint_query_budget(api_client, dataset, query_budget, url, budget):
+    api_client.get(ME_URL)
+    with query_budget(budget):
+        response = api_client.get(url, {"page": 1, "page_size": ROWS})
+    assert response.status_code == 200
+    assert len(response.data["results"]) >= ROWS
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, expand, budget", [(url, *value) for url, value in EXPANDED_BUDGETS.items()],
+                         ids=list(EXPANDED_BUDGETS))
+def test_expanded_list_query_budget(api_client, dataset, query_budget, url, expand, budget):
+    api_client.get(ME_URL)
+    with query_budget(budget):
+        response = api_client.get(url, {"page": 1, "page_size": ROWS, "expand": expand})
+    assert response.status_code == 200
+    assert all(isinstance(row[expand.split(",")[0]], dict) for row in response.data["results"])
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_relation_plan_is_computed_once_per_serializer_class():
+    assert class_relation_plan(company_controller.Serializer) == (["address"], [])
+    select, prefetch = class_relation_plan(user_controller.Serializer)
+    assert [lookup.prefetch_to for lookup in prefetch] == ["groups"]
+    assert class_relation_plan(user_controller.Serializer)[1] is prefetch
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_query_budget_reports_executed_queries(query_budget):
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, executed 2"):
+        with query_budget(1):
+            list(Company.objects.all())
+            list(Address.objects.all())
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@override_settings(NPLUSONE_DETECTION=True, NPLUSONE_THRESHOLD=3)
+def test_nplusone_middleware_reports_repeated_query_shapes(dataset, caplog):
+    def view(request):
+        # Klasyczne N+1: adres doczytywany osobno dla każdej firmy
+        for company in Company.objects.all():
+            company.address.city
+        return HttpResponse()
+
+    middleware = NPlusOneDetectionMiddleware(view)
+    with caplog.at_level(logging.WARNING, logger="app_construction_manager.queries"):
+        response = middleware(RequestFactory().get("/api/construction/manager/company/"))
+
+    companies = Company.objects.count()
+    assert int(response["X-NPlusOne-Queries"]) == companies
+    assert f"executed {companies} times" in caplog.text
+    assert connection.ops.quote_name("app_construction_manager_address") in caplog.text
+    assert "test_api_query_budgets.py" in caplog.text
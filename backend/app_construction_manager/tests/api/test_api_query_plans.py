@@ -0,0 +1,89 @@
+import re
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.db.models import Q
+from django.test import RequestFactory
+
+from app_construction_manager.controllers import Company, Products, User
+from app_construction_manager.models import Product
+from global_auth.models import CustomUser
+
+TEST_ORDER = 50
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason="Plan zapytania sprawdzamy na EXPLAIN QUERY PLAN z SQLite",
+)
+
+# Najczęstsze ścieżki z DataTable: filtr z Filter + domyślne sortowanie ViewSetu
+COMMON_FILTER_PATHS = [
+    ('company default list', Company.Filter, lambda: Company.model.objects.order_by('-created_at'), {}),
+    ('company is_active[]', Company.Filter, lambda: Company.model.objects.order_by('-created_at'),
+     {'is_active[]': ['true', 'false']}),
+    ('company created_at[]', Company.Filter, lambda: Company.model.objects.order_by('-created_at'),
+     {'created_at[]': ['2025-01-01', '2025-02-01']}),
+    ('company id range', Company.Filter, lambda: Company.model.objects.order_by('-created_at'),
+     {'id_min': '10', 'id_max': '20'}),
+    ('product default list', Products.Filter, lambda: Product.objects.order_by('-created_at'), {}),
+    ('product is_active', Products.Filter, lambda: Product.objects.order_by('-created_at'), {'is_active': 'true'}),
+    ('product company', Products.Filter, lambda: Product.objects.order_by('-created_at'), {'company': '1'}),
+    ('product usable_area range', Products.Filter, lambda: Product.objects.order_by('-created_at'),
+     {'usable_area_m2_min': '80', 'usable_area_m2_max': '120'}),
+    ('user company list', User.Filter, lambda: CustomUser.objects.filter(user_company=1).order_by('-email'), {}),
+    ('user groups[]', User.Filter, lambda: CustomUser.objects.filter(user_company=1).order_by('-email'),
+     {'groups[]': ['admin']}),
+]
+
+
+def explain(filterset_class, queryset, params):
+    request = RequestFactory().get('/', params)
+    return filterset_class(data=request.GET, queryset=queryset, request=request).qs.explain()
+
+
+def full_scans(plan):
+    # "SCAN tabela" bez "USING (COVERING) INDEX" oznacza odczyt całej tabeli
+    return [line for line in plan.splitlines() if re.search(r'\bSCAN \w+$', line.strip())]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'filterset_class, queryset, params',
+    [case[1:] for case in COMMON_FILTER_PATHS],
+    ids=[case[0] for case in COMMON_FILTER_PATHS],
+)
+def test_common_filter_paths_use_an_index(filterset_class, queryset, params):
+    plan = explain(filterset_class, queryset(), params)
+    assert full_scans(plan) == [], plan
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_full_scan_detection_catches_unindexed_filter():
+    # Kontrola samego testu: icontains po opisie nie ma prawa użyć indeksu
+    plan = explain(Products.Filter, Product.objects.all(), {'description': 'dom'})
+    assert full_scans(plan)
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize('values', [['Admin'], ['admin'], ['Kier', 'Pracownik'], ['Pracownik', 'brak'], ['']])
+def test_groups_filter_uses_exists_without_distinct(user_with_company, values):
+    groups = {name: Group.objects.get_or_create(name=name)[0] for name in ('Admin', 'Superadmin', 'Kierownik', 'Pracownik')}
+    for i, names in enumerate([['Admin'], ['Superadmin', 'Kierownik'], ['Pracownik', 'Kierownik'], [], ['Admin', 'Pracownik']]):
+        member = CustomUser.objects.create(email=f"grupa{i}@example.com", username=f"grupa{i}@example.com",
+                                           user_company=user_with_company.user_company)
+        member.groups.set([groups[name] for name in names])
+
+    request = RequestFactory().get('/', {'groups[]': values})
+    queryset = User.Filter(data=request.GET, queryset=CustomUser.objects.order_by('pk'), request=request).qs
+    sql = str(queryset.query).upper()
+    assert 'EXISTS' in sql and 'DISTINCT' not in sql
+
+    # Te same wiersze co poprzednie OR + distinct()
+    query = Q()
+    for value in values:
+        query |= Q(groups__name__icontains=value)
+    assert list(queryset) == list(CustomUser.objects.filter(query).distinct().order_by('pk'))
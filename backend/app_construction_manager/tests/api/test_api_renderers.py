@@ -0,0 +1,74 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_construction_manager.extra.Renderers import ORJSONRenderer
+
+User = get_user_model()
+TEST_ORDER = 62
+
+COMPANY_URL = "/api/construction/manager/company/"
+PAGE = {"page": 1, "page_size": 10}
+
+
+@pytest.fixture
+def staff_client():
+    staff = User.objects.create_user(email="staff@example.com", username="staff@example.com", password="x", is_staff=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(staff)}")
+    return client
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_orjson_output_matches_drf_json_renderer():
+    data = ReturnDict({
+        "created_at": datetime.datetime(2025, 3, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "warsaw": datetime.datetime(2025, 3, 1, 8, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=1))),
+        "day": datetime.date(2025, 3, 1),
+        "price": Decimal("1234.50"),
+        "label": gettext_lazy("Nieznane pole"),
+        "nested": [{"miasto": "Łódź", "area": 90.25, "empty": None, "active": True}],
+    }, serializer=None)
+
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert ORJSONRenderer().render(None) == b""
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_api_speaks_orjson(api_client):
+    response = api_client.get(COMPANY_URL, PAGE)
+    assert response["Content-Type"] == "application/json"
+    assert response.json()["results"] == response.data["results"]
+
+    response = api_client.post(COMPANY_URL, data=b'{"name": ', content_type="application/json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "JSON parse error" in response.json()["detail"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_browsable_api_only_for_staff(api_client, staff_client):
+    response = api_client.get(COMPANY_URL, PAGE, HTTP_ACCEPT="text/html,application/xhtml+xml,*/*;q=0.8")
+    assert response["Content-Type"] == "application/json"
+
+    response = staff_client.get(COMPANY_URL, PAGE, HTTP_ACCEPT="text/html,application/xhtml+xml,*/*;q=0.8")
+    assert response["Content-Type"].startswith("text/html")
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_messagepack_negotiation(api_client):
+    msgpack = pytest.importorskip("msgpack")
+
+    response = api_client.get(COMPANY_URL, PAGE, HTTP_ACCEPT="application/msgpack, application/json;q=0.9")
+    assert response["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content, raw=False) == api_client.get(COMPANY_URL, PAGE).json()
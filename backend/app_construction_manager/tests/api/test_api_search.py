@@ -0,0 +1,163 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from rest_framework import status
+
+from app_construction_manager.extra.Search import NgramSearchBackend
+from app_construction_manager.models import Address, Company, Product, SearchToken
+
+TEST_ORDER = 51
+
+PRODUCTS_URL = "/api/construction/manager/products/"
+COMPANY_URL = "/api/construction/manager/company/"
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+def make_product(company, user, name, description="Projekt domu jednorodzinnego"):
+    return Product.objects.create(
+        name=name,
+        description=description,
+        price_net=1000.0,
+        price_gross=1230.0,
+        estimated_duration_weeks=20,
+        usable_area_m2=120.0,
+        net_area_m2=110.0,
+        gross_volume_m3=400.0,
+        is_active=True,
+        company=company,
+        create_by=user,
+    )
+
+
+def names(response):
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return [row['name'] for row in response.data['results']]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_search_matches_prefix_and_ignores_polish_diacritics(api_client, user, company):
+    make_product(company, user, "Dworek Łąkowy")
+    make_product(company, user, "Willa Komfort")
+
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'dwor', 'page': 1, 'page_size': 10})) == ["Dworek Łąkowy"]
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'lakowy', 'page': 1, 'page_size': 10})) == ["Dworek Łąkowy"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_search_tolerates_typos_and_requires_every_word(api_client, user, company):
+    make_product(company, user, "Magnolia Komfort")
+    make_product(company, user, "Magnolia Premium")
+
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'magnlia', 'page': 1, 'page_size': 10})) == [
+        "Magnolia Premium", "Magnolia Komfort",
+    ]
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'magnolia premum', 'page': 1, 'page_size': 10})) == [
+        "Magnolia Premium",
+    ]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_search_ranks_name_matches_above_description_matches(api_client, user, company):
+    make_product(company, user, "Dom Klasyczny", description="Projekt z tarasem i garażem")
+    make_product(company, user, "Taras Słoneczny", description="Projekt domu parterowego")
+
+    results = names(api_client.get(PRODUCTS_URL, {'search': 'taras', 'page': 1, 'page_size': 10}))
+    assert results == ["Taras Słoneczny", "Dom Klasyczny"]
+
+    # Jawne sortowanie ma pierwszeństwo przed rankingiem
+    results = names(api_client.get(PRODUCTS_URL, {'search': 'taras', 'ordering': 'name', 'page': 1, 'page_size': 10}))
+    assert results == ["Dom Klasyczny", "Taras Słoneczny"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_index_follows_updates_and_deletes(api_client, user, company):
+    product = make_product(company, user, "Jantar")
+    product.name = "Bursztyn"
+    product.save()
+
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'jantar', 'page': 1, 'page_size': 10})) == []
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'bursztyn', 'page': 1, 'page_size': 10})) == ["Bursztyn"]
+
+    product.delete()
+    assert not SearchToken.objects.filter(model_label='app_construction_manager.product', object_id=product.pk).exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_company_search_covers_address_and_follows_address_changes(api_client, company):
+    assert names(api_client.get(COMPANY_URL, {'search': 'test city', 'page': 1, 'page_size': 10})) == ["Test Company"]
+
+    address = Address.objects.get(pk=company.address_id)
+    address.city = "Gdańsk"
+    address.save()
+
+    assert names(api_client.get(COMPANY_URL, {'search': 'gdansk', 'page': 1, 'page_size': 10})) == ["Test Company"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_rebuild_search_index_covers_bulk_created_rows(api_client, user, company):
+    Product.objects.bulk_create([
+        Product(
+            name="Laguna", description="Projekt", price_net=1.0, price_gross=1.0, estimated_duration_weeks=1,
+            usable_area_m2=1.0, net_area_m2=1.0, gross_volume_m3=1.0, is_active=True, company=company, create_by=user,
+        )
+    ])
+    # Bez indeksu wiersz znajduje dopasowanie fragmentu (jak w SearchFilter), ale nie literówka
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'laguna', 'page': 1, 'page_size': 10})) == ["Laguna"]
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'lagna', 'page': 1, 'page_size': 10})) == []
+
+    call_command('rebuild_search_index', stdout=None)
+    assert names(api_client.get(PRODUCTS_URL, {'search': 'lagna', 'page': 1, 'page_size': 10})) == ["Laguna"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_search_keeps_substring_matches(api_client, company):
+    company.address.city = "Warszawa"
+    company.address.save()
+    company.phone_number_1 = "48123456789"
+    company.save()
+
+    for term in ("ars", "mpan", "6789"):
+        assert names(api_client.get(COMPANY_URL, {'search': term, 'page': 1, 'page_size': 10})) == ["Test Company"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_migration_backfills_search_index(user, company):
+    migration = import_module('app_construction_manager.migrations.0005_searchtoken')
+    SearchToken.objects.all().delete()
+    migration.build_search_index(apps, None)
+
+    assert SearchToken.objects.filter(model_label='app_construction_manager.company', object_id=company.pk).exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_search_uses_index_instead_of_scanning_the_table(user, company):
+    if connection.vendor != 'sqlite':
+        pytest.skip("plan zapytania sprawdzany na SQLite")
+    make_product(company, user, "Warszawa")
+
+    queryset = NgramSearchBackend().search(Product.objects.all(), ["warszawa"])
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = [row[-1] for row in cursor.fetchall()]
+
+    # icontains tylko na wierszach spoza indeksu (zakres pk), reszta przez SearchToken
+    assert not any(step.startswith("SCAN app_construction_manager_product") for step in plan), plan
+    assert "SEARCH app_construction_manager_product USING INTEGER PRIMARY KEY (rowid>?)" in plan
+    assert list(queryset.values_list('name', flat=True)) == ["Warszawa"]
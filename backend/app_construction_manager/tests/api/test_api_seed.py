@@ -0,0 +1,57 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from app_construction_manager.benchmarks.dataset import generate_chunk, seed_dataset
+from app_construction_manager.extra.Bulk import MAX_QUERY_PARAMS, batch_size
+from app_construction_manager.models import Company, Product, SearchToken
+
+User = get_user_model()
+TEST_ORDER = 55
+
+
+def names(rows):
+    return [(company.name, [product.name for product in products]) for company, products, _ in rows]
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_generated_rows_depend_only_on_seed_and_chunk():
+    assert names(generate_chunk((7, 0, 3, 2, False))) == names(generate_chunk((7, 0, 3, 2, False)))
+    assert names(generate_chunk((7, 0, 3, 2, False))) != names(generate_chunk((7, 200, 3, 2, False)))
+    assert names(generate_chunk((7, 0, 3, 2, False))) != names(generate_chunk((8, 0, 3, 2, False)))
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", [Company, Product, SearchToken, User])
+def test_batches_fit_mssql_parameter_limit(model):
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    assert batch_size(model) * len(fields) <= MAX_QUERY_PARAMS < 2100
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_seed_links_rows_and_indexes_them_for_search(api_client):
+    owner = seed_dataset(companies=2, products_per_company=3, users=4, seed=3, workers=1, log=lambda message: None)
+
+    companies = Company.objects.filter(create_by=owner).select_related('address')
+    assert len(companies) == 2
+    assert all(company.address.city for company in companies)
+    assert Product.objects.filter(company__in=companies).count() == 6
+    assert User.objects.filter(user_company=owner.user_company).count() == 3
+    assert User.objects.filter(user_company__in=companies, groups__isnull=False).count() == 4
+
+    product = Product.objects.filter(company__in=companies).first()
+    assert SearchToken.objects.filter(model_label='app_construction_manager.product', object_id=product.pk).exists()
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("options", [{}, {"load": "snapshot.bin"}])
+def test_seed_refuses_non_empty_database_without_flush(company_payload, options):
+    Company.objects.create(**company_payload(as_instance=True))
+
+    with pytest.raises(CommandError, match="--flush"):
+        call_command("seed", companies=1, products_per_company=1, users=1, workers=1, **options)
+    assert Company.objects.count() == 1
@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_construction_manager.extra.Instrumentation import ServerTimingMiddleware, slow_requests
+from app_construction_manager.models import Company
+
+User = get_user_model()
+TEST_ORDER = 53
+
+SLOW_REQUESTS_URL = "/api/construction/manager/diagnostics/slow-requests/"
+
+
+@pytest.fixture(autouse=True)
+def empty_slow_requests():
+    slow_requests.clear()
+    yield
+    slow_requests.clear()
+
+
+def server_timing(response):
+    entries = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        entries[name] = dict(param.split("=", 1) for param in params)
+    return entries
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/api/construction/manager/company/", "/api/construction/manager/products/"])
+def test_list_response_has_server_timing(api_client, url):
+    response = api_client.get(url, {"page": 1, "page_size": 10})
+    assert response.status_code == status.HTTP_200_OK
+
+    timing = server_timing(response)
+    assert set(timing) == {"db", "serialize", "render", "total"}
+    assert timing["db"]["desc"].endswith(' queries"')
+    assert int(timing["db"]["desc"].strip('"').split()[0]) >= 1
+    assert float(timing["total"]["dur"]) >= float(timing["db"]["dur"])
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+@override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+def test_slow_requests_are_kept_with_their_sql():
+    def view(request):
+        list(Company.objects.all())
+        return HttpResponse()
+
+    middleware = ServerTimingMiddleware(view)
+    middleware(RequestFactory().get("/api/construction/manager/company/?page=2"))
+    middleware(RequestFactory().get("/admin/"))
+
+    [entry] = slow_requests.all()
+    assert entry["path"] == "/api/construction/manager/company/?page=2"
+    assert entry["query_count"] == 1
+    assert "app_construction_manager_company" in entry["sql"][0]["sql"]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_slow_request_log_is_admin_only(api_client):
+    slow_requests.add({"path": "/api/construction/manager/products/", "sql": []})
+
+    assert api_client.get(SLOW_REQUESTS_URL).status_code == status.HTTP_403_FORBIDDEN
+
+    staff = User.objects.create(email="admin@example.com", username="admin", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(staff)
+    response = client.get(SLOW_REQUESTS_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 1
+
+    assert client.delete(SLOW_REQUESTS_URL).status_code == status.HTTP_204_NO_CONTENT
+    assert slow_requests.all() == []
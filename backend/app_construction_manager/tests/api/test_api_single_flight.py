@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_construction_manager.extra.SingleFlight import SingleFlight, get_single_flight
+
+User = get_user_model()
+TEST_ORDER = 64
+
+COMPANY_URL = "/api/construction/manager/company/"
+SINGLE_FLIGHT_URL = "/api/construction/manager/diagnostics/single-flight/"
+PAGE = {"page": 1, "page_size": 10}
+
+
+def wait_until(condition, timeout=5):
+    # Ograniczone czekanie - regresja kończy się błędem testu zamiast zawieszenia
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "SingleFlight nie osiągnął oczekiwanego stanu"
+        time.sleep(0.005)
+
+
+def run_concurrently(flight, key, fn, followers):
+    # Lider blokuje się w fn, dopóki wszyscy pozostali nie czekają na jego wynik
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"])
+    threads = [threading.Thread(target=call) for _ in range(followers)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: flight.stats()["coalesced"] >= followers)
+    return leader, threads, results, errors
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "wynik"
+
+    leader, threads, results, errors = run_concurrently(flight, "klucz", fn, followers=4)
+    release.set()
+    for thread in [leader, *threads]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["wynik"] * 5 and not errors
+    assert flight.stats() == {
+        "in_flight": 0, "timeout": 5, "leaders": 1, "coalesced": 4,
+        "timeouts": 0, "errors": 0, "coalesced_ratio": 0.8,
+    }
+
+    # Po zakończeniu klucz jest wolny - kolejne wywołanie znowu liczy
+    assert flight.do("klucz", lambda: "nowy") == "nowy"
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_followers_reraise_leader_error():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise ValueError("baza niedostępna")
+
+    leader, threads, results, errors = run_concurrently(flight, "klucz", fn, followers=2)
+    release.set()
+    for thread in [leader, *threads]:
+        thread.join(5)
+
+    assert not results
+    assert [str(error) for error in errors] == ["baza niedostępna"] * 3
+    assert flight.stats()["errors"] == 1
+
+
+@pytest.mark.order(TEST_ORDER)
+def test_follower_runs_itself_after_timeout():
+    flight = SingleFlight(timeout=0.05)
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("klucz", lambda: release.wait(5)))
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"])
+
+    assert flight.do("klucz", lambda: "własny") == "własny"
+    assert flight.stats()["timeouts"] == 1
+
+    release.set()
+    leader.join(5)
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_list_miss_goes_through_single_flight(api_client):
+    flight = get_single_flight()
+    flight.clear()
+
+    response = api_client.get(COMPANY_URL, PAGE)
+    assert response["X-Cache"] == "MISS"
+    assert flight.stats()["leaders"] >= 1
+    assert api_client.get(COMPANY_URL, PAGE)["X-Cache"] == "HIT"
+
+    with override_settings(SINGLE_FLIGHT={"ENABLED": False}):
+        assert get_single_flight() is None
+        response = api_client.get(COMPANY_URL, {**PAGE, "page_size": 5})
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_single_flight_diagnostics_for_staff_only(api_client):
+    assert api_client.get(SINGLE_FLIGHT_URL).status_code == status.HTTP_403_FORBIDDEN
+
+    staff = User.objects.create_user(email="flight@example.com", username="flight@example.com", password="x", is_staff=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(staff)}")
+
+    api_client.get(COMPANY_URL, PAGE)
+    assert client.get(SINGLE_FLIGHT_URL).json()["leaders"] >= 1
+    assert client.delete(SINGLE_FLIGHT_URL).status_code == status.HTTP_204_NO_CONTENT
+    assert client.get(SINGLE_FLIGHT_URL).json()["leaders"] == 0
@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from app_construction_manager.models import Company, Product
+
+TEST_ORDER = 60
+
+COMPANY_URL = "/api/construction/manager/company/"
+PRODUCTS_URL = "/api/construction/manager/products/"
+PAGE = {"page": 1, "page_size": 10}
+
+
+@pytest.fixture
+def company(company_payload):
+    return Company.objects.create(**company_payload(as_instance=True))
+
+
+@pytest.fixture
+def product(user, company):
+    return Product.objects.create(
+        name="Dom Wybrane Pola",
+        description="Projekt testowy",
+        price_net=1000.0,
+        price_gross=1230.0,
+        estimated_duration_weeks=20,
+        usable_area_m2=100.0,
+        net_area_m2=90.0,
+        gross_volume_m3=300.0,
+        is_active=True,
+        company=company,
+        create_by=user,
+    )
+
+
+def page_queries(context, table):
+    return [query["sql"] for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"] and "COUNT(" not in query["sql"]]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_fields_narrow_response_and_nested_serializer(api_client, company):
+    response = api_client.get(COMPANY_URL, {**PAGE, "fields": "id,name,address.city"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"][0] == {"id": company.id, "name": company.name, "address": {"city": "Test City"}}
+
+    # Bez parametru odpowiedź się nie zmienia
+    assert "vat_id" in api_client.get(COMPANY_URL, PAGE).data["results"][0]
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_fields_narrow_selected_columns(api_client, product):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(PRODUCTS_URL, {**PAGE, "fields": "id,name"})
+    assert response.data["results"][0] == {"id": product.id, "name": product.name}
+
+    [sql] = page_queries(context, Product._meta.db_table)
+    assert '"name"' in sql
+    assert '"description"' not in sql
+    assert "JOIN" not in sql
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_expand_joins_only_requested_relations(api_client, user, product):
+    response = api_client.get(PRODUCTS_URL, PAGE)
+    assert response.data["results"][0]["company"] == product.company_id
+
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(PRODUCTS_URL, {**PAGE, "fields": "id,company.name,create_by", "expand": "company,create_by"})
+    row = response.data["results"][0]
+    assert row["company"] == {"name": product.company.name}
+    assert set(row["create_by"]) == {"id", "first_name", "last_name", "email"}
+    assert (row["create_by"]["id"], row["create_by"]["email"]) == (user.id, user.email)
+
+    [sql] = page_queries(context, Product._meta.db_table)
+    assert sql.count("JOIN") == 2
+
+
+@pytest.mark.order(TEST_ORDER)
+@pytest.mark.django_db
+def test_unknown_fields_are_rejected(api_client, company):
+    response = api_client.get(COMPANY_URL, {**PAGE, "fields": "id,nie_ma"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "fields" in response.data
+
+    response = api_client.get(COMPANY_URL, {**PAGE, "expand": "address"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from app_construction_manager.controllers.Company import ViewSet as CompanyViewSet
 from app_construction_manager.controllers.Products import ViewSet as ProductsViewSet
 from app_construction_manager.controllers.User import ViewSet as UserViewSet
+from app_construction_manager.controllers.Diagnostics import AuthCacheView, ListCacheView, SingleFlightView, SlowRequestsView
 
 router = DefaultRouter()
 router.register(r'company', CompanyViewSet)
@@ -10,5 +11,9 @@ router.register(r'products', ProductsViewSet)
 router.register(r'user', UserViewSet)
 
 urlpatterns = [
+    path('diagnostics/slow-requests/', SlowRequestsView.as_view(), name='slow-requests'),
+    path('diagnostics/list-cache/', ListCacheView.as_view(), name='list-cache'),
+    path('diagnostics/auth-cache/', AuthCacheView.as_view(), name='auth-cache'),
+    path('diagnostics/single-flight/', SingleFlightView.as_view(), name='single-flight'),
     path('', include(router.urls))
 ]
@@ -13,6 +13,7 @@ class CustomUserAdmin(BaseUserAdmin):
     )
 
     list_display = BaseUserAdmin.list_display + ("get_company",)
+    list_select_related = ("user_company",)
 
     def get_company(self, obj):
         return obj.user_company.name if obj.user_company else "—"
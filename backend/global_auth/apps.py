@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GlobalAuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "global_auth"
+
+    def ready(self):
+        from . import signals  # noqa: F401
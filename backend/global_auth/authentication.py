@@ -0,0 +1,163 @@
+import copy
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from global_project.cache import VERSION_KEY, LocalLRUBackend, bump_keys, model_label, versioned_cache_enabled
+
+AUTH_VERSION_KEY = 'cm:auth:{}'
+DEFAULTS = {'MAX_ENTRIES': 1000, 'TIMEOUT': 60, 'UNSHARED_TIMEOUT': 5}
+TOKEN_DEFAULTS = {'MAX_ENTRIES': 10000}
+
+_users = None
+_tokens = None
+
+
+def get_user_cache():
+    global _users
+    config = {**DEFAULTS, **getattr(settings, 'AUTH_USER_CACHE', {})}
+    # Wersje cm:auth:* w cache procesu nie docierają do innych workerów - wtedy dezaktywacja
+    # albo zmiana hasła działa najpóźniej po UNSHARED_TIMEOUT sekundach
+    timeout = config['TIMEOUT'] if versioned_cache_enabled() else min(config['TIMEOUT'], config['UNSHARED_TIMEOUT'])
+    if _users is None or (_users.max_entries, _users.timeout) != (config['MAX_ENTRIES'], timeout):
+        _users = LocalLRUBackend(config['MAX_ENTRIES'], timeout)
+    return _users
+
+
+class TokenCache:
+    """
+    Already validated access tokens by sha256 of the raw token; an entry lives
+    until the token's `exp`, so expiry is still enforced without re-verifying.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.backend = LocalLRUBackend(max_entries, 0)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, raw_token):
+        token = self.backend.get(hashlib.sha256(raw_token).hexdigest())
+        with self.lock:
+            if token is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return token
+
+    def set(self, raw_token, token):
+        timeout = token.get('exp', 0) - time.time()
+        if timeout > 0:
+            self.backend.set(hashlib.sha256(raw_token).hexdigest(), token, timeout)
+
+    def clear(self):
+        self.backend.clear()
+        with self.lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.backend),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else None,
+        }
+
+
+def get_token_cache():
+    global _tokens
+    config = {**TOKEN_DEFAULTS, **getattr(settings, 'AUTH_TOKEN_CACHE', {})}
+    if _tokens is None or _tokens.max_entries != config['MAX_ENTRIES']:
+        _tokens = TokenCache(config['MAX_ENTRIES'])
+    return _tokens
+
+
+def invalidate_users(*user_ids):
+    bump_keys(*[AUTH_VERSION_KEY.format(user_id) for user_id in user_ids])
+
+
+def auth_version(user_id):
+    # Wersja użytkownika + wersje grup i firm: zmiana członkostwa w grupie podbija wersję Group (signals.py)
+    company = get_user_model()._meta.get_field('user_company').related_model
+    keys = [AUTH_VERSION_KEY.format(user_id), VERSION_KEY.format(model_label(Group)), VERSION_KEY.format(model_label(company))]
+    values = cache.get_many(keys)
+    return '.'.join(str(values.get(key, 0)) for key in keys)
+
+
+def copy_user(user):
+    """
+    Per-request copy of a cached user: besides the user's own fields it copies
+    the preloaded `user_company` and the prefetched groups, so concurrent
+    requests never share (and mutate) the same related instances.
+    """
+    clone = copy.copy(user)
+    clone._state.fields_cache = {name: copy.copy(value) for name, value in user._state.fields_cache.items()}
+    clone._prefetched_objects_cache = {}
+    for name, queryset in getattr(user, '_prefetched_objects_cache', {}).items():
+        rows = copy.copy(queryset)
+        rows._result_cache = [copy.copy(row) for row in queryset]
+        clone._prefetched_objects_cache[name] = rows
+    return clone
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication keeping resolved users in a short-TTL per-process LRU,
+    keyed by user id and auth version, with `user_company` and groups preloaded.
+    Every request gets its own copy of the cached user (`copy_user`).
+
+    Signature checks of AUTH_TOKEN_CLASSES (SIMPLE_JWT backend) run once per
+    token; later requests with the same token reuse the validated token.
+    """
+
+    def get_validated_token(self, raw_token):
+        tokens = get_token_cache()
+        token = tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            tokens.set(raw_token, token)
+        return token
+
+    def load_user(self, user_id):
+        queryset = self.user_model.objects.select_related('user_company').prefetch_related('groups')
+        try:
+            return queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        users = get_user_cache()
+        key = f"{user_id}:{auth_version(user_id)}"
+        user = users.get(key)
+        if user is None:
+            user = self.load_user(user_id)
+            users.set(key, user)
+        user = copy_user(user)
+
+        # Te same sprawdzenia co w JWTAuthentication.get_user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
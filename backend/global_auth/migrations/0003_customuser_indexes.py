@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 15:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("global_auth", "0002_customuser_user_company"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                fields=["user_company", "email"], name="user_company_email_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                fields=["user_company", "-date_joined"], name="user_company_joined_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+def fill_primary_group_name(apps, schema_editor):
+    # Jeden UPDATE - bez tego ?ordering=groups nie sortowałby istniejących użytkowników
+    # do czasu ręcznego backfill_primary_group_name (zostaje do ponownej synchronizacji)
+    from global_auth.models import update_primary_group_name
+
+    update_primary_group_name(
+        apps.get_model("global_auth", "CustomUser").objects.all(),
+        group_model=apps.get_model("auth", "Group"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("global_auth", "0003_customuser_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="primary_group_name",
+            field=models.CharField(blank=True, editable=False, max_length=150, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(fields=["user_company", "primary_group_name"], name="user_company_group_idx"),
+        ),
+        migrations.RunPython(fill_primary_group_name, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,31 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, Group
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from app_construction_manager.models import Company
 
 class CustomUser(AbstractUser):
     user_company = models.ForeignKey(Company, on_delete=models.SET_NULL, null=True, blank=True)
     email = models.EmailField(unique=True)
+    # Pierwsza alfabetycznie nazwa grupy (sortowanie listy po grupach bez JOIN + GROUP BY),
+    # utrzymywana przez global_auth/signals.py, uzupełniana komendą backfill_primary_group_name
+    primary_group_name = models.CharField(max_length=150, null=True, blank=True, editable=False)
 
     USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = []
\ No newline at end of file
+    REQUIRED_FIELDS = []
+
+    class Meta(AbstractUser.Meta):
+        # Lista użytkowników jest zawsze zawężona do user_company (controllers/User.py)
+        indexes = [
+            models.Index(fields=['user_company', 'email'], name='user_company_email_idx'),
+            models.Index(fields=['user_company', '-date_joined'], name='user_company_joined_idx'),
+            models.Index(fields=['user_company', 'primary_group_name'], name='user_company_group_idx'),
+        ]
+
+
+def update_primary_group_name(users, group_model=Group):
+    """
+    Recomputes primary_group_name of a user queryset with one UPDATE (no signals).
+    Migrations pass their historical Group as `group_model`.
+    """
+    first_group = group_model.objects.filter(user=OuterRef('pk')).order_by('name').values('name')[:1]
+    return users.update(primary_group_name=Subquery(first_group))
\ No newline at end of file
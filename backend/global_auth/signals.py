@@ -0,0 +1,45 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from global_auth.authentication import invalidate_users
+from global_auth.models import CustomUser, update_primary_group_name
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Zmiany grup podbijają wersję Group (app_construction_manager/signals.py), która też jest w kluczu
+    invalidate_users(instance.pk)
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+def refresh_primary_group_name(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # group.user_set.clear() - po wyczyszczeniu nie wiadomo już, których użytkowników to dotyczyło
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        update_primary_group_name(CustomUser.objects.filter(pk=instance.pk))
+    elif action == 'post_clear':
+        update_primary_group_name(CustomUser.objects.filter(pk__in=instance._cleared_user_ids))
+    elif pk_set:
+        update_primary_group_name(CustomUser.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Group)
+def rename_primary_group_name(sender, instance, created, **kwargs):
+    if not created:
+        update_primary_group_name(CustomUser.objects.filter(groups=instance))
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_members(sender, instance, **kwargs):
+    instance._member_ids = list(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def refresh_after_group_delete(sender, instance, **kwargs):
+    update_primary_group_name(CustomUser.objects.filter(pk__in=getattr(instance, '_member_ids', [])))
@@ -0,0 +1,21 @@
+# Ustawienia dla `python manage.py benchmark --settings=global_project.benchmark_settings`
+# Osobna baza SQLite - benchmark czyści i wypełnia ją danymi testowymi
+import os
+
+from global_project.settings import *  # noqa: F401,F403
+from global_project.settings import BASE_DIR
+
+DEBUG = False
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get("BENCHMARK_DATABASE", BASE_DIR / "benchmark.sqlite3"),
+    }
+}
+
+# Instrumentacja deweloperska zaburza pomiary
+NPLUSONE_DETECTION = False
+SLOW_REQUEST_THRESHOLD_MS = 60 * 60 * 1000
+# Benchmark działa w jednym procesie - cache zliczeń i list w pamięci procesu jest poprawny
+WEB_CONCURRENCY = 1
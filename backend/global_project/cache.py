@@ -0,0 +1,96 @@
+"""
+Cache helpers shared by the apps: version counters in CACHES['default'] and a per-process LRU.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db import transaction
+
+VERSION_KEY = 'cm:version:{}'
+
+# Cache żyjące w pamięci jednego procesu - podbicie wersji nie dociera do pozostałych workerów
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+NO_CACHES = ('django.core.cache.backends.dummy.DummyCache',)
+
+
+def versioned_cache_enabled():
+    """
+    Whether caches invalidated by version counters (counts, list responses) may be used.
+
+    The counters live in CACHES['default']; a per-process cache only works with
+    a single worker (WEB_CONCURRENCY=1), otherwise a write in one worker would
+    leave the other workers serving stale data until the entries expire.
+    """
+    backend = settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND']
+    if backend in NO_CACHES:
+        return False
+    if backend in PROCESS_LOCAL_CACHES:
+        return getattr(settings, 'WEB_CONCURRENCY', None) == 1
+    return True
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def bump_keys(*keys):
+    """
+    Increments version counters stored under `keys`.
+    The second bump on commit covers readers that cached rows of a transaction
+    that was still open during the first bump.
+    """
+    def bump():
+        for key in keys:
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def get_versions(*models):
+    keys = [VERSION_KEY.format(model_label(model)) for model in models]
+    values = cache.get_many(keys)
+    return tuple(values.get(key, 0) for key in keys)
+
+
+class LocalLRUBackend:
+    """Per-process LRU with TTL; the least recently used entry goes first when full."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (self.timeout if timeout is None else timeout), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
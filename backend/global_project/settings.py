@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 import environ
 import os
@@ -41,11 +42,38 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 50000
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "global_auth.authentication.CachedJWTAuthentication",
         'rest_framework.authentication.SessionAuthentication',
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # orjson zamiast json z biblioteki standardowej; MessagePack tylko gdy zainstalowany pakiet msgpack
+    "DEFAULT_RENDERER_CLASSES": [
+        "app_construction_manager.extra.Renderers.ORJSONRenderer",
+        *(["app_construction_manager.extra.Renderers.MessagePackRenderer"] if find_spec("msgpack") else []),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app_construction_manager.extra.Renderers.ORJSONParser",
+        *(["app_construction_manager.extra.Renderers.MessagePackParser"] if find_spec("msgpack") else []),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Przeglądarkowe API (HTML) tylko dla staff
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS": "app_construction_manager.extra.Renderers.StaffBrowsableContentNegotiation",
+}
+
+# Użytkownicy uwierzytelnieni tokenem JWT (global_auth/authentication.py) - LRU w pamięci procesu.
+# Unieważniany wersjami cm:auth:* z CACHES["default"]; gdy nie jest on współdzielony (patrz WEB_CONCURRENCY),
+# wpis żyje tylko UNSHARED_TIMEOUT sekund, żeby dezaktywacja i zmiana hasła szybko docierały do innych workerów
+AUTH_USER_CACHE = {
+    "MAX_ENTRIES": 1000,
+    "TIMEOUT": 60,
+    "UNSHARED_TIMEOUT": 5,
+}
+# Zweryfikowane tokeny dostępowe (hash tokenu -> claims), wpis wygasa razem z tokenem
+AUTH_TOKEN_CACHE = {
+    "MAX_ENTRIES": 10000,
 }
 
 SIMPLE_JWT = {
@@ -73,6 +101,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "app_construction_manager.extra.Instrumentation.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     'django.middleware.locale.LocaleMiddleware',
@@ -81,8 +110,43 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "app_construction_manager.extra.Queries.NPlusOneDetectionMiddleware",
 ]
 
+# Wykrywanie powtarzających się zapytań (N+1) w obrębie jednego requestu - tylko w trybie deweloperskim
+NPLUSONE_DETECTION = DEBUG
+NPLUSONE_THRESHOLD = 5
+
+# Nagłówek Server-Timing dla API oraz bufor ostatnich wolnych requestów (z SQL) - działa też przy DEBUG=False
+SERVER_TIMING_PATH_PREFIX = "/api/construction/manager/"
+SLOW_REQUEST_THRESHOLD_MS = 500
+SLOW_REQUEST_LOG_SIZE = 100
+SLOW_REQUEST_MAX_SQL = 50
+
+# Wersje modeli (extra/Cache.py) unieważniające zliczenia i cache list; przy wielu workerach muszą być
+# współdzielone: CACHE_URL=redis://host:6379/0 (wymaga pakietu redis). Domyślny locmem działa tylko w jednym procesie.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# Liczba workerów (ta sama zmienna co w gunicorn). Z cache w pamięci procesu zliczenia i cache list są włączone
+# tylko przy WEB_CONCURRENCY=1; bez tej zmiennej zakładamy, że workerów może być więcej, i je wyłączamy.
+WEB_CONCURRENCY = env.int("WEB_CONCURRENCY", default=None)
+
+# Cache odpowiedzi list (extra/ResponseCache.py), unieważniany wersjami modeli z CACHES["default"].
+# "local" - LRU w pamięci procesu, "shared" - CACHES[ALIAS]
+LIST_RESPONSE_CACHE = {
+    "BACKEND": env("LIST_RESPONSE_CACHE_BACKEND", default="local"),
+    "MAX_ENTRIES": 1000,
+    "TIMEOUT": 300,
+    "ALIAS": "default",
+}
+# Łączenie równoczesnych identycznych zapytań list / COUNT w jedno wykonanie (extra/SingleFlight.py);
+# TIMEOUT - po ilu sekundach czekający request przestaje czekać i wykonuje zapytanie sam
+SINGLE_FLIGHT = {
+    "ENABLED": True,
+    "TIMEOUT": 10,
+}
+# list/export serializowane przez extra/Compiled.py (.values() + gotowe konwertery) zamiast pól DRF
+COMPILED_SERIALIZERS = True
+
 ROOT_URLCONF = "global_project.urls"
 
 TEMPLATES = [
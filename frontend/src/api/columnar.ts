@@ -0,0 +1,26 @@
+// src/api/columnar.ts
+
+export interface ColumnarPage {
+    columns: string[];
+    rows: any[][];
+    count: number;
+    [key: string]: any;
+}
+
+// ?format=columnar -> { results, count, ... }; kolumny "address.city" wracają do zagnieżdżonych obiektów w jednym przebiegu
+export function decodeColumnar({ columns, rows, ...rest }: ColumnarPage) {
+    const paths = columns.map((column) => column.split('.'));
+    const results = rows.map((values) => {
+        const row: Record<string, any> = {};
+        for (let i = 0; i < paths.length; i++) {
+            const path = paths[i];
+            let target = row;
+            for (let j = 0; j < path.length - 1; j++) {
+                target = target[path[j]] ??= {};
+            }
+            target[path[path.length - 1]] = values[i];
+        }
+        return row;
+    });
+    return { ...rest, results };
+}
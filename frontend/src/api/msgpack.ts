@@ -0,0 +1,92 @@
+// src/api/msgpack.ts
+
+import api from '@/api/apiService';
+
+export const MSGPACK = 'application/msgpack';
+
+// Dekoder MessagePack wystarczający dla odpowiedzi API (backend koduje ten sam dokument co JSON)
+export function decode(buffer: ArrayBuffer): any {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const text = new TextDecoder();
+    let offset = 0;
+
+    const str = (length: number) => {
+        const value = text.decode(bytes.subarray(offset, offset + length));
+        offset += length;
+        return value;
+    };
+    const bin = (length: number) => {
+        const value = bytes.slice(offset, offset + length);
+        offset += length;
+        return value;
+    };
+    const array = (length: number) => {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) value[i] = read();
+        return value;
+    };
+    const map = (length: number) => {
+        const value: Record<string, any> = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            value[key] = read();
+        }
+        return value;
+    };
+    const next = (size: number) => {
+        offset += size;
+        return offset - size;
+    };
+
+    function read(): any {
+        const type = bytes[offset++];
+        if (type <= 0x7f) return type;
+        if (type <= 0x8f) return map(type & 0x0f);
+        if (type <= 0x9f) return array(type & 0x0f);
+        if (type <= 0xbf) return str(type & 0x1f);
+        if (type >= 0xe0) return type - 0x100;
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return bin(view.getUint8(next(1)));
+            case 0xc5: return bin(view.getUint16(next(2)));
+            case 0xc6: return bin(view.getUint32(next(4)));
+            case 0xca: return view.getFloat32(next(4));
+            case 0xcb: return view.getFloat64(next(8));
+            case 0xcc: return view.getUint8(next(1));
+            case 0xcd: return view.getUint16(next(2));
+            case 0xce: return view.getUint32(next(4));
+            case 0xcf: return Number(view.getBigUint64(next(8)));
+            case 0xd0: return view.getInt8(next(1));
+            case 0xd1: return view.getInt16(next(2));
+            case 0xd2: return view.getInt32(next(4));
+            case 0xd3: return Number(view.getBigInt64(next(8)));
+            case 0xd9: return str(view.getUint8(next(1)));
+            case 0xda: return str(view.getUint16(next(2)));
+            case 0xdb: return str(view.getUint32(next(4)));
+            case 0xdc: return array(view.getUint16(next(2)));
+            case 0xdd: return array(view.getUint32(next(4)));
+            case 0xde: return map(view.getUint16(next(2)));
+            case 0xdf: return map(view.getUint32(next(4)));
+        }
+        throw new Error(`MessagePack: nieobsługiwany typ 0x${type.toString(16)}`);
+    }
+
+    return read();
+}
+
+// GET preferujący MessagePack; gdy backend nie ma pakietu msgpack, odpowiada JSON-em
+export async function getPacked<T = any>(url: string, params?: Record<string, any>): Promise<T> {
+    const response = await api.get(url, {
+        params,
+        responseType: 'arraybuffer',
+        headers: { Accept: `${MSGPACK}, application/json;q=0.9` }
+    });
+    const contentType = String(response.headers['content-type'] ?? '');
+    if (contentType.startsWith(MSGPACK)) {
+        return decode(response.data);
+    }
+    return JSON.parse(new TextDecoder().decode(response.data));
+}